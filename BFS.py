@@ -3,16 +3,23 @@
 """
 #===============================================================================
 import sys
+import time
 import numpy as np
 import Queue
+import collections
+import heapq
+import multiprocessing
+import csrGraph
 
 
 #===============================================================================
-def readFile(inputFile):
+def readFile(inputFile, csr = False):
     """ Read an adjacency list from an input file.
 
         Args:
           inputFile: The input file name and location.
+          csr:       If True return a CSRGraph rather than a dictionary. Default
+                     is False.
 
         Returns:
           G: An adjacency list representation of a graph.
@@ -27,6 +34,11 @@ def readFile(inputFile):
         print 'Cannot open', inputFile
         return 1
 
+    if csr:
+        G = csrGraph.readAdjacencyList(inF)
+        inF.close()
+        return G
+
     adjList = {}
     for line in inF:
         linedata = line.rstrip('\n').split()
@@ -41,20 +53,37 @@ def readFile(inputFile):
     return adjList
 
 #-------------------------------------------------------------------------------
-def BFS(G, s):
+def BFS(G, s, mode = 'queue', **options):
     """ Breadth First Search (BFS) of a graph G, starting from node s.
 
         Args:
-          G: adjacency list representation of a graph.
-          s: start node.
+          G:       adjacency list representation of a graph, or a CSRGraph.
+          s:       start node.
+          mode:    'queue' to explore one node at a time, 'level' to explore
+                   one level at a time (see BFSLevelSynchronous),
+                   'direction' to switch between top-down and bottom-up
+                   levels (see BFSDirectionOptimizing) or 'parallel' to
+                   explore each level with a pool of processes (see
+                   parallelBFS). Default is 'queue'.
+          options: Keyword arguments passed on to the search for the mode,
+                   e.g. alpha, beta and counters for 'direction' or
+                   numWorkers for 'parallel'.
 
         Returns:
           exploredList: A dictionary giving a boolean value for whether a node
-                        has been explored or not.
+                        has been explored or not. An array indexed by node if
+                        G is a CSRGraph.
 
         Raises:
-          None.
+          ValueError: If mode is not recognised.
     """
+
+    if mode != 'queue' or isinstance(G, csrGraph.CSRGraph):
+        dist = BFSShortestPath(G, s, mode, **options)
+        if isinstance(G, csrGraph.CSRGraph):
+            return (dist >= 0).astype(np.int8)
+        else:
+            return dict((v, int(d < np.inf)) for v, d in dist.iteritems())
     
     exploredList = dict.fromkeys(G.keys(), 0)  # Initialise as zero
 
@@ -76,20 +105,45 @@ def BFS(G, s):
     return exploredList
 
 #-------------------------------------------------------------------------------
-def BFSShortestPath(G, s):
+def BFSShortestPath(G, s, mode = 'queue', **options):
     """ Find shortest paths using Breadth First Search (BFS).
 
         Args:
-          G: adjacency list representation of a graph.
-          s: start node.
+          G:       adjacency list representation of a graph, or a CSRGraph.
+          s:       start node.
+          mode:    'queue' to explore one node at a time, 'level' to explore
+                   one level at a time (see BFSLevelSynchronous),
+                   'direction' to switch between top-down and bottom-up
+                   levels (see BFSDirectionOptimizing) or 'parallel' to
+                   explore each level with a pool of processes (see
+                   parallelBFS). Default is 'queue'.
+          options: Keyword arguments passed on to the search for the mode,
+                   e.g. alpha, beta and counters for 'direction' or
+                   numWorkers for 'parallel'.
 
         Returns:
-          dist: dictionary giving distance (in # edges) of node from s.
+          dist: dictionary giving distance (in # edges) of node from s. An
+                array indexed by node, with -1 for unreachable nodes, if G is a
+                CSRGraph.
 
         Raises:
-          None.
+          ValueError: If mode is not recognised.
     """
 
+    searches = {'queue':     BFSShortestPathArray,
+                'level':     BFSLevelSynchronous,
+                'direction': BFSDirectionOptimizing,
+                'parallel':  parallelBFS}
+
+    if mode not in searches:
+        raise ValueError('Unknown BFS mode: ' + str(mode))
+
+    if isinstance(G, csrGraph.CSRGraph):
+        return searches[mode](G, s, **options)
+    elif mode != 'queue':
+        dist = searches[mode](csrGraph.fromAdjList(G), s, **options)
+        return dict((v, dist[v] if dist[v] >= 0 else np.inf) for v in G)
+
     exploredList = dict.fromkeys(G.keys(), 0)  # Initialise as zero
     dist = dict.fromkeys(G.keys(), np.inf)
 
@@ -112,6 +166,720 @@ def BFSShortestPath(G, s):
 
     return dist
 
+#-------------------------------------------------------------------------------
+def BFSShortestPathArray(G, s):
+    """ Find shortest paths in a CSR graph G using Breadth First Search (BFS).
+
+        The CSR arrays are converted to lists once, so taking one node at a
+        time from the queue costs a list slice rather than numpy calls; for
+        large graphs BFSLevelSynchronous is much faster still.
+
+        Args:
+          G: CSRGraph representation of a graph.
+          s: start node.
+
+        Returns:
+          dist: int array, dist[v] is the distance (in # edges) of node v from
+                s, or -1 if v cannot be reached from s.
+
+        Raises:
+          None.
+    """
+
+    offsets    = G.offsets.tolist()
+    neighbours = G.neighbours.tolist()
+
+    dist    = [-1] * G.numNodes
+    dist[s] = 0
+
+    # A deque avoids the locking overhead of Queue.Queue
+    Q = collections.deque([s])
+
+    while Q:
+        v     = Q.popleft()  # remove first entry of the queue
+        level = dist[v] + 1
+
+        for w in neighbours[offsets[v]:offsets[v + 1]]:
+            if dist[w] < 0:  # if w has not been explored
+                dist[w] = level
+                Q.append(w)
+
+    return np.array(dist, dtype = G.neighbours.dtype)
+
+#-------------------------------------------------------------------------------
+def BFSLevelSynchronous(G, s):
+    """ Find shortest paths in a CSR graph G, one BFS level at a time.
+
+        Rather than taking one node at a time from a queue, the neighbours of
+        every node in the frontier (the nodes at distance k from s) are
+        gathered at once, the explored nodes are masked out and the rest are
+        given distance k + 1, all as array operations. The distances are the
+        same as BFSShortestPathArray.
+
+        Args:
+          G: CSRGraph representation of a graph.
+          s: start node.
+
+        Returns:
+          dist: int array, dist[v] is the distance (in # edges) of node v from
+                s, or -1 if v cannot be reached from s.
+
+        Raises:
+          None.
+    """
+
+    dist    = np.full(G.numNodes, -1, dtype = G.neighbours.dtype)
+    dist[s] = 0
+    owner   = np.zeros(G.numNodes, dtype = np.int64)  # Scratch for de-dupe
+
+    frontier = np.array([s], dtype = G.neighbours.dtype)
+    level    = 0
+
+    while len(frontier) > 0:
+        level += 1
+
+        # Unexplored nodes connected to the frontier
+        W = csrGraph.gatherNeighbours(G, frontier)
+        W = W[dist[W] < 0]
+
+        # Remove duplicates in linear time: the last write to owner[w] wins,
+        # so keep only the occurrence of w which made it.
+        iW       = np.arange(len(W))
+        owner[W] = iW
+        frontier = W[owner[W] == iW]
+
+        dist[frontier] = level
+
+    return dist
+
+#-------------------------------------------------------------------------------
+def BFSDirectionOptimizing(G, s, alpha = 14, beta = 24, counters = None):
+    """ Find shortest paths in a CSR graph G using direction-optimizing BFS.
+
+        Each level is explored either top-down, as in BFSLevelSynchronous, or
+        bottom-up, where every unexplored node scans its incoming edges for a
+        parent in the frontier and stops at the first one found. Bottom-up is
+        cheaper for the large middle levels of low-diameter graphs, top-down
+        for small frontiers.
+
+        Switch to bottom-up when the frontier has more than 1 / alpha of the
+        edges out of the unexplored nodes, and back to top-down when the
+        frontier has fewer than 1 / beta of the nodes.
+
+        Args:
+          G:        CSRGraph representation of a graph.
+          s:        start node.
+          alpha:    Top-down to bottom-up switch parameter. Default is 14.
+          beta:     Bottom-up to top-down switch parameter. Default is 24.
+          counters: Optional dictionary; if supplied, the number of levels
+                    and edges examined by each strategy are added to the keys
+                    'topDownLevels', 'topDownEdges', 'bottomUpLevels' and
+                    'bottomUpEdges'.
+
+        Returns:
+          dist: int array, dist[v] is the distance (in # edges) of node v from
+                s, or -1 if v cannot be reached from s.
+
+        Raises:
+          None.
+    """
+
+    if counters is None:
+        counters = {}
+    for key in ['topDownLevels', 'topDownEdges', 'bottomUpLevels',
+                'bottomUpEdges']:
+        counters.setdefault(key, 0)
+
+    Grev   = G.transpose()  # Incoming edges, for the bottom-up levels
+    degree = G.outDegree()
+
+    dist    = np.full(G.numNodes, -1, dtype = G.neighbours.dtype)
+    dist[s] = 0
+    owner   = np.zeros(G.numNodes, dtype = np.int64)  # Scratch for de-dupe
+
+    frontier        = np.array([s], dtype = G.neighbours.dtype)
+    level           = 0
+    topDown         = True
+    unexploredEdges = G.numEdges - degree[s]
+
+    while len(frontier) > 0:
+        level += 1
+
+        # Choose the direction of this level
+        if topDown and degree[frontier].sum() > unexploredEdges / alpha:
+            topDown = False
+        elif not topDown and len(frontier) < G.numNodes / beta:
+            topDown = True
+
+        if topDown:
+            # Unexplored nodes connected to the frontier, de-duplicated as in
+            # BFSLevelSynchronous.
+            W = csrGraph.gatherNeighbours(G, frontier)
+            counters['topDownLevels'] += 1
+            counters['topDownEdges']  += len(W)
+
+            W        = W[dist[W] < 0]
+            iW       = np.arange(len(W))
+            owner[W] = iW
+            frontier = W[owner[W] == iW]
+
+        else:
+            # Unexplored nodes scan their incoming edges for a frontier node.
+            # The edges are scanned in chunks of doubling width, and a node
+            # drops out as soon as a chunk contains a parent.
+            nodes  = np.flatnonzero(dist < 0)
+            starts = Grev.offsets[nodes].astype(np.int64)
+            ends   = Grev.offsets[nodes + 1].astype(np.int64)
+            found  = [np.zeros(0, dtype = G.neighbours.dtype)]
+            width  = 1
+            counters['bottomUpLevels'] += 1
+
+            while len(nodes) > 0:
+                stops   = np.minimum(starts + width, ends)
+                lengths = stops - starts
+                E       = csrGraph.rangeIndices(starts, lengths)
+                counters['bottomUpEdges'] += len(E)
+
+                isParent  = dist[Grev.neighbours[E]] == level - 1
+                iNode     = np.repeat(np.arange(len(nodes)), lengths)
+                hasParent = np.zeros(len(nodes), dtype = bool)
+                hasParent[iNode[isParent]] = True
+                found.append(nodes[hasParent])
+
+                keep   = ~hasParent & (stops < ends)
+                nodes  = nodes[keep]
+                starts = stops[keep]
+                ends   = ends[keep]
+                width *= 2
+
+            frontier = np.concatenate(found).astype(G.neighbours.dtype)
+
+        dist[frontier]   = level
+        unexploredEdges -= degree[frontier].sum()
+
+    return dist
+
+#-------------------------------------------------------------------------------
+def BFSPath(G, s, t, counters = None):
+    """ Find a shortest path from s to t using bidirectional BFS.
+
+        A level synchronous BFS is run forwards from s and backwards from t,
+        always expanding the side with fewer edges to scan, until the two
+        searches meet. Usually only a small part of the graph is explored.
+        Each side records the node it was reached from in a predecessor array,
+        from which the path is rebuilt.
+
+        Args:
+          G:        CSRGraph representation of a graph, or an adjacency list
+                    which is converted to a CSRGraph.
+          s:        start node.
+          t:        target node.
+          counters: Optional dictionary; if supplied, the number of nodes
+                    explored by the two searches is added to the key
+                    'explored'.
+
+        Returns:
+          dist: distance (in # edges) of t from s, or -1 if t cannot be
+                reached from s.
+          path: list of nodes on a shortest path from s to t, or an empty list
+                if t cannot be reached from s.
+
+        Raises:
+          None.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        G = csrGraph.fromAdjList(G)
+
+    if counters is None:
+        counters = {}
+    counters.setdefault('explored', 0)
+
+    if s == t:
+        counters['explored'] += 1
+        return 0, [s]
+
+    # Forward search on G from s, backward search on the transpose from t
+    graphs   = [G, G.transpose()]
+    dist     = [np.full(G.numNodes, -1, dtype = G.neighbours.dtype)
+                for side in range(2)]
+    pred     = [np.full(G.numNodes, -1, dtype = G.neighbours.dtype)
+                for side in range(2)]
+    frontier = [np.array([s], dtype = G.neighbours.dtype),
+                np.array([t], dtype = G.neighbours.dtype)]
+    level    = [0, 0]
+    owner    = np.zeros(G.numNodes, dtype = np.int64)  # Scratch for de-dupe
+
+    dist[0][s] = 0
+    dist[1][t] = 0
+    counters['explored'] += 2
+
+    while len(frontier[0]) > 0 and len(frontier[1]) > 0:
+
+        # Expand the side with fewer edges to scan
+        degrees = [graphs[side].offsets[frontier[side] + 1] -
+                   graphs[side].offsets[frontier[side]] for side in range(2)]
+        side    = int(degrees[1].sum() < degrees[0].sum())
+        other   = 1 - side
+
+        E = csrGraph.edgeIndices(graphs[side], frontier[side])
+        W = graphs[side].neighbours[E]
+        V = np.repeat(frontier[side], degrees[side])  # Node W is reached from
+
+        # Unexplored nodes, de-duplicated as in BFSLevelSynchronous
+        unexplored = dist[side][W] < 0
+        W          = W[unexplored]
+        V          = V[unexplored]
+        iW         = np.arange(len(W))
+        owner[W]   = iW
+        first      = owner[W] == iW
+        W          = W[first]
+
+        level[side]         += 1
+        dist[side][W]        = level[side]
+        pred[side][W]        = V[first]
+        frontier[side]       = W
+        counters['explored'] += len(W)
+
+        # The searches meet at nodes explored by both; the best has the
+        # smallest distance on the other side.
+        meet = W[dist[other][W] >= 0]
+        if len(meet) > 0:
+            m = meet[np.argmin(dist[other][meet])]
+
+            # Walk back to s and on to t along the predecessors
+            path = [m]
+            while path[0] != s:
+                path.insert(0, pred[0][path[0]])
+            while path[-1] != t:
+                path.append(pred[1][path[-1]])
+
+            return len(path) - 1, [int(v) for v in path]
+
+    return -1, []
+
+#-------------------------------------------------------------------------------
+def multiSourceBFS(G, sources):
+    """ Find shortest paths from many start nodes at once using BFS.
+
+        Each node keeps a bitset, one bit per start node, in an array of
+        uint64 words, so 64 searches are advanced by every word operation. At
+        each level the frontier bitsets of the nodes at the tail of each edge
+        are OR'd into the node at its head, the bits already visited are
+        masked out, and the new bits give the nodes at that distance from each
+        start node. The graph is scanned once per level rather than once per
+        level per start node.
+
+        Args:
+          G:       CSRGraph representation of a graph.
+          sources: List of start nodes.
+
+        Returns:
+          dist: int32 array of shape (len(sources), G.numNodes), dist[i, v] is
+                the distance (in # edges) of node v from sources[i], or -1 if v
+                cannot be reached from sources[i].
+
+        Raises:
+          None.
+    """
+
+    sources  = np.asarray(sources, dtype = np.int64)
+    k        = len(sources)
+    numWords = (k + 63) // 64
+
+    # Distances + 1 (0 for unreached) are filled in node-major order, a row
+    # of k at a time. They are kept in bytes while the levels fit, which
+    # quarters the memory traffic.
+    reached = np.zeros((G.numNodes, k), dtype = np.uint8)
+    reached[sources, np.arange(k)] = 1
+
+    # Table reversing the bits of a byte, so that unpacking little endian
+    # bitsets gives bit i in column i.
+    reverseBits = np.packbits(np.unpackbits(np.arange(256, dtype = np.uint8)
+                                            ).reshape(256, 8)[:, ::-1])
+
+    # Bit i of word i // 64 is set for search i. Bitsets are stored little
+    # endian so their bytes can be unpacked in order.
+    visited = np.zeros((G.numNodes, numWords), dtype = '<u8')
+    for i, s in enumerate(sources):
+        visited[s, i // 64] |= np.uint64(1) << np.uint64(i % 64)
+    frontier = visited.copy()
+    active   = np.unique(sources)  # Nodes with a non-empty frontier bitset
+    level    = 0
+
+    while len(active) > 0:
+        level += 1
+
+        # Every edge out of an active node, sorted by head node
+        E     = csrGraph.edgeIndices(G, active)
+        W     = G.neighbours[E]
+        V     = np.repeat(active, G.offsets[active + 1] - G.offsets[active])
+        order = np.argsort(W, kind = 'quicksort')
+        W     = W[order]
+        V     = V[order]
+
+        if len(W) == 0:
+            break
+
+        # OR together the frontier bitsets arriving at each head node, then
+        # keep the bits which have not been visited.
+        starts = np.flatnonzero(np.r_[True, W[1:] != W[:-1]])
+        bits   = np.bitwise_or.reduceat(frontier[V], starts, axis = 0)
+        W      = W[starts]
+        bits  &= ~visited[W]
+
+        hasNew = bits.any(axis = 1)
+        W      = W[hasNew]
+        bits   = bits[hasNew]
+
+        visited[W]       |= bits
+        frontier[active]  = 0
+        frontier[W]       = bits
+        active            = W
+
+        if level + 1 > np.iinfo(reached.dtype).max:
+            reached = reached.astype(np.int32)
+
+        # Unpack the bitsets, column i is search i, and set the new bits to
+        # level + 1 (the entries are still 0).
+        isNew       = np.unpackbits(reverseBits[bits.view(np.uint8)], axis = 1)
+        reached[W] += isNew[:, :k] * reached.dtype.type(level + 1)
+
+    dist = reached.T.astype(np.int32) - 1
+
+    return dist
+
+#-------------------------------------------------------------------------------
+# Graph and distances shared with the parallelBFS worker processes
+workerState = {}
+
+def initParallelBFSWorker(G, dist):
+    """ Store the shared graph and distances in a parallelBFS worker. """
+
+    workerState['G']    = G
+    workerState['dist'] = dist
+
+#-------------------------------------------------------------------------------
+def expandFrontierSlice(frontier):
+    """ Return the unexplored nodes connected to a slice of the frontier.
+
+        Run in a parallelBFS worker process.
+    """
+
+    G    = workerState['G']
+    dist = workerState['dist']
+
+    W = csrGraph.gatherNeighbours(G, frontier)
+
+    return np.unique(W[dist[W] < 0])
+
+#-------------------------------------------------------------------------------
+def parallelBFS(G, s, numWorkers = None):
+    """ Find shortest paths in a CSR graph G using a pool of processes.
+
+        The graph and the distances are copied to shared memory, and the nodes
+        are split into one contiguous block per worker with about the same
+        number of edges. At each level the frontier is split by block, each
+        worker returns the unexplored nodes connected to its slice of the
+        frontier, and they are merged and given the next distance. The
+        distances are the same as BFSShortestPathArray.
+
+        Args:
+          G:          CSRGraph representation of a graph.
+          s:          start node.
+          numWorkers: Number of worker processes. Default is None; if default
+                      is supplied the number of CPUs is used.
+
+        Returns:
+          dist: int array, dist[v] is the distance (in # edges) of node v from
+                s, or -1 if v cannot be reached from s.
+
+        Raises:
+          None.
+    """
+
+    if numWorkers is None:
+        numWorkers = multiprocessing.cpu_count()
+
+    sharedG = csrGraph.toSharedMemory(G)
+    dist    = csrGraph.sharedArray(G.numNodes, G.neighbours.dtype)
+    dist[:] = -1
+    dist[s] = 0
+    owner   = np.zeros(G.numNodes, dtype = np.int64)  # Scratch for de-dupe
+
+    # First node of each worker's block, splitting the edges evenly
+    edgeSplits = np.linspace(0, G.numEdges, numWorkers + 1)
+    bounds     = np.searchsorted(G.offsets, edgeSplits)
+    bounds[0]  = 0
+    bounds[-1] = G.numNodes
+
+    pool = multiprocessing.Pool(numWorkers, initParallelBFSWorker,
+                                (sharedG, dist))
+    try:
+        frontier = np.array([s], dtype = G.neighbours.dtype)
+        level    = 0
+
+        while len(frontier) > 0:
+            level += 1
+
+            # Split the frontier by block
+            frontier = np.sort(frontier)
+            splits   = np.searchsorted(frontier, bounds[1:-1])
+            slices   = [S for S in np.split(frontier, splits) if len(S) > 0]
+
+            # Merge the workers' new nodes, de-duplicated as in
+            # BFSLevelSynchronous.
+            W        = np.concatenate(pool.map(expandFrontierSlice, slices))
+            iW       = np.arange(len(W))
+            owner[W] = iW
+            frontier = W[owner[W] == iW]
+
+            dist[frontier] = level
+    finally:
+        pool.close()
+        pool.join()
+
+    return np.array(dist)
+
+#-------------------------------------------------------------------------------
+def benchmarkParallelBFS(G, s, maxWorkers = None):
+    """ Print the time taken by parallelBFS with 1, 2, 4, ... workers.
+
+        Args:
+          G:          CSRGraph representation of a graph.
+          s:          start node.
+          maxWorkers: Largest number of workers. Default is None; if default
+                      is supplied the number of CPUs is used.
+
+        Returns:
+          times: Dictionary of number of workers to time taken in seconds.
+
+        Raises:
+          None.
+    """
+
+    if maxWorkers is None:
+        maxWorkers = multiprocessing.cpu_count()
+
+    startTime = time.time()
+    BFSLevelSynchronous(G, s)
+    print 'Serial:', time.time() - startTime, 's'
+
+    # 1, 2, 4, ... workers, then maxWorkers
+    workerCounts = [2 ** i for i in range(int(np.log2(maxWorkers)) + 1)]
+    if workerCounts[-1] != maxWorkers:
+        workerCounts.append(maxWorkers)
+
+    times = {}
+    for numWorkers in workerCounts:
+        startTime = time.time()
+        parallelBFS(G, s, numWorkers)
+        times[numWorkers] = time.time() - startTime
+
+        print numWorkers, 'workers:', times[numWorkers], 's',
+        print '(speed up', times[1] / times[numWorkers], ')'
+
+    return times
+
+#-------------------------------------------------------------------------------
+class DynamicBFS:
+    """ Shortest path distances from a start node, kept up to date as edges
+        are inserted and deleted.
+
+        The graph is a CSRGraph plus the changes made to it, so only the
+        edges which change are stored again. An update repairs the distances
+        of the nodes it affects and leaves the rest alone:
+          Insertion of (u, v): if u gives v a shorter path, the new distances
+            spread out from v as in BFS.
+          Deletion of (u, v): the nodes left with no shortest path parent are
+            found level by level from v, then given their new distances from
+            the unaffected nodes around them, closest first.
+    """
+
+    def __init__(self, G, s, dist = None):
+        """ Args:
+              G:    CSRGraph representation of a graph, or an adjacency list
+                    which is converted to a CSRGraph.
+              s:    start node.
+              dist: Distances from s, as returned by BFSShortestPath(G, s).
+                    Default is None; if default is supplied they are
+                    computed.
+        """
+
+        if not isinstance(G, csrGraph.CSRGraph):
+            G = csrGraph.fromAdjList(G)
+        if dist is None:
+            dist = BFSLevelSynchronous(G, s)
+
+        self.G    = G
+        self.Grev = G.transpose()
+        self.s    = s
+        self.dist = np.array(dist, dtype = np.int64)
+
+        # Change in the number of copies of edge (u, v), and the nodes at the
+        # other end of the edges added to each node.
+        self.delta        = collections.defaultdict(int)
+        self.addedOut     = collections.defaultdict(set)
+        self.addedIn      = collections.defaultdict(set)
+        self.nodesTouched = 0  # Nodes whose distance was re-examined
+
+
+    def numEdges(self, u, v):
+        """ Return the number of copies of edge (u, v) in the graph. """
+
+        count = self.delta.get((u, v), 0)
+        if u < self.G.numNodes:
+            count += np.count_nonzero(self.G.neighbourList(u) == v)
+
+        return count
+
+
+    def adjacent(self, v, graph, added):
+        """ Return the nodes joined to v in graph or by an added edge. """
+
+        nodes = set(added.get(v, ()))
+        if v < graph.numNodes:
+            nodes.update(graph.neighbourList(v).tolist())
+
+        return nodes
+
+
+    def successors(self, v):
+        """ Return the nodes w with an edge (v, w). """
+
+        # Only edges which have been changed may have no copies left
+        return [w for w in self.adjacent(v, self.G, self.addedOut)
+                if (v, w) not in self.delta or self.numEdges(v, w) > 0]
+
+
+    def predecessors(self, v):
+        """ Return the nodes u with an edge (u, v). """
+
+        return [u for u in self.adjacent(v, self.Grev, self.addedIn)
+                if (u, v) not in self.delta or self.numEdges(u, v) > 0]
+
+
+    def distance(self, v):
+        """ Return the distance of node v from s, or -1 if v is unreachable. """
+
+        return int(self.dist[v])
+
+
+    def distances(self):
+        """ Return a copy of the array of distances from s. """
+
+        return self.dist.copy()
+
+
+    def insertEdge(self, u, v):
+        """ Insert edge (u, v) and repair the distances. """
+
+        self.delta[(u, v)] += 1
+        self.addedOut[u].add(v)
+        self.addedIn[v].add(u)
+
+        dist = self.dist
+        if dist[u] < 0 or 0 <= dist[v] <= dist[u] + 1:
+            return  # No shorter paths
+
+        dist[v] = dist[u] + 1
+        Q = collections.deque([v])
+
+        while Q:
+            x = Q.popleft()
+            self.nodesTouched += 1
+            for y in self.successors(x):
+                if dist[y] < 0 or dist[y] > dist[x] + 1:
+                    dist[y] = dist[x] + 1
+                    Q.append(y)
+
+
+    def deleteEdge(self, u, v):
+        """ Delete one copy of edge (u, v) and repair the distances.
+
+            Raises:
+              ValueError: If there is no edge (u, v).
+        """
+
+        if self.numEdges(u, v) == 0:
+            raise ValueError('No edge ' + str((u, v)) + ' to delete.')
+
+        self.delta[(u, v)] -= 1
+
+        dist = self.dist
+        if (dist[v] != dist[u] + 1 or dist[u] < 0 or
+            self.numEdges(u, v) > 0):
+            return  # Not the last copy of a shortest path edge
+
+        # Find the affected nodes, those left with no parent at the previous
+        # level which is unaffected. They are found in order of distance, so
+        # every affected parent of a node is known before it is checked.
+        affected = set()
+        if not self.hasParent(v, affected):
+            affected.add(v)
+            Q = collections.deque([v])
+            while Q:
+                x = Q.popleft()
+                for y in self.successors(x):
+                    if (dist[y] == dist[x] + 1 and y not in affected and
+                        not self.hasParent(y, affected)):
+                        affected.add(y)
+                        Q.append(y)
+
+        if not affected:
+            return
+
+        # Best distance of each affected node through an unaffected node
+        for x in affected:
+            dist[x] = -1
+        heap = []
+        for x in affected:
+            self.nodesTouched += 1
+            parentDist = [dist[p] for p in self.predecessors(x)
+                          if p not in affected and dist[p] >= 0]
+            if parentDist:
+                heapq.heappush(heap, (min(parentDist) + 1, x))
+
+        # Settle the affected nodes closest first
+        while heap:
+            d, x = heapq.heappop(heap)
+            if 0 <= dist[x] <= d:
+                continue  # Already settled
+            dist[x] = d
+            for y in self.successors(x):
+                if y in affected and (dist[y] < 0 or dist[y] > d + 1):
+                    heapq.heappush(heap, (d + 1, y))
+
+
+    def hasParent(self, v, affected):
+        """ Is there an unaffected node u with an edge (u, v) and
+            dist[u] = dist[v] - 1?
+        """
+
+        for u in self.predecessors(v):
+            if u not in affected and self.dist[u] == self.dist[v] - 1:
+                return True
+
+        return False
+
+
+    def applyUpdates(self, insertions = (), deletions = ()):
+        """ Apply a batch of edge deletions, then a batch of edge insertions.
+
+            Args:
+              insertions: Iterable of (u, v) edges to insert.
+              deletions:  Iterable of (u, v) edges to delete.
+
+            Raises:
+              ValueError: If an edge to delete is not in the graph.
+        """
+
+        for u, v in deletions:
+            self.deleteEdge(u, v)
+        for u, v in insertions:
+            self.insertEdge(u, v)
+
+
 #-------------------------------------------------------------------------------
 def main(args):
     """ Run main code.
@@ -5,14 +5,33 @@
 import sys
 import numpy as np
 import Queue
+import collections
+import csrGraph
 
 
 #===============================================================================
-def readFile(inputFile):
+class CycleError(ValueError):
+    """ Raised when a graph which should be acyclic has a cycle.
+
+        Attributes:
+          edge: An edge (u, v) of the cycle; v is an ancestor of u in the
+                depth first search, so (u, v) is a back edge.
+    """
+
+    def __init__(self, edge):
+        ValueError.__init__(self, 'Graph has a cycle through edge ' +
+                            str(edge) + '.')
+        self.edge = edge
+
+
+#===============================================================================
+def readFile(inputFile, csr = False):
     """ Read an adjacency list from an input file.
 
         Args:
           inputFile: The input file name and location.
+          csr:       If True return a CSRGraph rather than a dictionary. Default
+                     is False.
 
         Returns:
           G: An adjacency list representation of a graph.
@@ -27,6 +46,11 @@ def readFile(inputFile):
         print 'Cannot open', inputFile
         return 1
 
+    if csr:
+        G = csrGraph.readAdjacencyList(inF)
+        inF.close()
+        return G
+
     adjList = {}
     for line in inF:
         linedata = line.rstrip('\n').split()
@@ -45,16 +69,21 @@ def DFS(G, s):
     """ Depth First Search (DFS) of a graph G, starting from node s.
 
         Args:
-          G: adjacency list representation of a graph.
+          G: adjacency list representation of a graph, or a CSRGraph (e.g.
+             from csrGraph.loadBinary).
           s: start node.
 
         Returns:
           exploredList: A dictionary giving a boolean value for whether a node
-                        has been explored or not.
+                        has been explored or not. An array indexed by node if
+                        G is a CSRGraph.
 
         Raises:
           None.
     """
+
+    if isinstance(G, csrGraph.CSRGraph):
+        return DFSArray(G, s)
     
     exploredList = dict.fromkeys(G.keys(), 0)  # Initialise as zero (False)
 
@@ -74,6 +103,120 @@ def DFS(G, s):
 
     return exploredList
 
+#-------------------------------------------------------------------------------
+def DFSArray(G, s):
+    """ Depth First Search (DFS) of a CSR graph G, starting from node s.
+
+        Args:
+          G: CSRGraph representation of a graph.
+          s: start node.
+
+        Returns:
+          explored: int8 array, explored[v] is 1 if node v has been explored
+                    and 0 otherwise.
+
+        Raises:
+          None.
+    """
+
+    explored = np.zeros(G.numNodes, dtype = np.int8)
+
+    # A list is a stack without the locking overhead of Queue.LifoQueue
+    S = [s]
+
+    while S:
+        v = S.pop()  # remove last entry of the stack
+
+        if not explored[v]:  # If it has been explored go back 1 step
+            explored[v] = 1  # Mark as explored
+
+            # Add the unexplored nodes connected to v to the stack
+            W = G.neighbourList(v)
+            S.extend(W[explored[W] == 0].tolist())
+
+    return explored
+
+#-------------------------------------------------------------------------------
+def DFSEvents(G, s = None):
+    """ Depth First Search (DFS) of a graph G, as a lazy stream of events.
+
+        The search uses an explicit stack and yields each event as it
+        happens, so the caller can stop at any point and only the stack and
+        the discovery times are held in memory. The events are:
+          ('discover', v):     v is reached for the first time.
+          ('finish', v):       all edges out of v have been followed.
+          ('tree', (v, w)):    edge to w, which is discovered through it.
+          ('back', (v, w)):    edge to w, an ancestor of v still on the stack.
+          ('forward', (v, w)): edge to w, a finished descendant of v.
+          ('cross', (v, w)):   edge to w, a finished node in another branch.
+        In an undirected graph each edge appears in both directions, so the
+        reverse of each tree edge is reported as a back edge.
+
+        Args:
+          G: adjacency list representation of a graph, or a CSRGraph.
+          s: start node. Default is None; if default is supplied every node
+             is searched from in turn, giving a DFS forest.
+
+        Yields:
+          event: Tuple of the event name and the node or edge.
+
+        Raises:
+          None.
+    """
+
+    isCSR = isinstance(G, csrGraph.CSRGraph)
+
+    # Discovery time of each node, -1 if undiscovered, and whether finished
+    if isCSR:
+        nodes     = range(G.numNodes)
+        discovery = np.full(G.numNodes, -1, dtype = np.int64)
+        finished  = np.zeros(G.numNodes, dtype = np.int8)
+    else:
+        nodes     = G.keys()
+        discovery = dict.fromkeys(nodes, -1)
+        finished  = dict.fromkeys(nodes, 0)
+
+    if s is not None:
+        nodes = [s]
+
+    time = 0
+
+    for root in nodes:
+        if discovery[root] >= 0:
+            continue
+
+        discovery[root] = time
+        time += 1
+        yield ('discover', root)
+
+        # Stack of nodes, their adjacent nodes and the index of the next one
+        stack = [(root, G.neighbourList(root) if isCSR else G[root], [0])]
+
+        while stack:
+            v, W, nextW = stack[-1]
+
+            if nextW[0] < len(W):
+                w         = W[nextW[0]]
+                nextW[0] += 1
+
+                if discovery[w] < 0:
+                    yield ('tree', (v, w))
+                    discovery[w] = time
+                    time += 1
+                    yield ('discover', w)
+                    stack.append((w, G.neighbourList(w) if isCSR else G[w],
+                                  [0]))
+                elif not finished[w]:
+                    yield ('back', (v, w))
+                elif discovery[w] > discovery[v]:
+                    yield ('forward', (v, w))
+                else:
+                    yield ('cross', (v, w))
+            else:
+                stack.pop()
+                finished[v] = 1
+                yield ('finish', v)
+
 #-------------------------------------------------------------------------------
 def DFSRecursive(G, s, exploredList):
     """ Depth First Search (DFS) of a graph G, starting from node s recursively.
@@ -140,29 +283,447 @@ def DFSRecursive2(G, s, exploredList, nodeOrder, currentLabel):
 def topologicalOrder(G):
     """ Topologically order nodes a graph using DFS.
 
+        The depth first search uses an explicit stack rather than recursion,
+        so long paths do not hit the recursion limit. Nodes are labelled n,
+        n - 1, ..., 1 as they finish, as in DFSRecursive2.
+
         Args:
-          G: Adjacency list of a graph.
+          G: Adjacency list of a graph, or a CSRGraph.
 
         Returns:
-          nodeOrder: Order of nodes.
+          nodeOrder: Order of nodes. A dictionary of node to label, or an int
+                     array indexed by node if G is a CSRGraph.
 
         Raises:
-          None.
+          CycleError: If the graph has a cycle.
     """
-    
-    exploredList = dict.fromkeys(G.keys(), 0)  # Initialise as zero
-    nodeOrder    = dict.fromkeys(G.keys())
+
+    if isinstance(G, csrGraph.CSRGraph):
+        return topologicalOrderArray(G)
+
+    # 0 unexplored, 1 on the stack, 2 finished
+    state     = dict.fromkeys(G.keys(), 0)
+    nodeOrder = dict.fromkeys(G.keys())
 
     currentLabel = len(G.keys())
 
-    for v in G:
-        if not exploredList[v]:
-            exploredList, nodeOrder, currentLabel = DFSRecursive2(G, v,
-                                                       exploredList, nodeOrder,
-                                                       currentLabel)
+    for s in G:
+        if state[s]:
+            continue
+
+        # Stack of nodes and the index of the next edge to follow from each
+        state[s]  = 1
+        stack     = [s]
+        nextEdges = [0]
+
+        while stack:
+            v = stack[-1]
+            i = nextEdges[-1]
+
+            if i < len(G[v]):
+                nextEdges[-1] = i + 1
+                w = G[v][i]
+                if state[w] == 0:
+                    state[w] = 1
+                    stack.append(w)
+                    nextEdges.append(0)
+                elif state[w] == 1:
+                    raise CycleError((v, w))
+            else:
+                stack.pop()
+                nextEdges.pop()
+                state[v]      = 2
+                nodeOrder[v]  = currentLabel
+                currentLabel -= 1
 
     return nodeOrder
+
+#-------------------------------------------------------------------------------
+def topologicalOrderArray(G):
+    """ Topologically order nodes of a CSR graph using DFS.
+
+        The same as topologicalOrder, on the CSR arrays converted to lists
+        once: indexing a numpy array one element at a time is much slower
+        than indexing a list. The labels become an array on return.
+
+        Args:
+          G: CSRGraph of a graph.
+
+        Returns:
+          nodeOrder: int array, nodeOrder[v] is the label 1, ..., n of node v.
+
+        Raises:
+          CycleError: If the graph has a cycle.
+    """
+
+    n          = G.numNodes
+    offsets    = G.offsets.tolist()
+    neighbours = G.neighbours.tolist()
+
+    # 0 unexplored, 1 on the stack, 2 finished
+    state     = [0] * n
+    nodeOrder = [0] * n
+
+    currentLabel = n
+
+    for s in range(n):
+        if state[s]:
+            continue
+
+        # Stack of nodes and the position of the next edge to follow from each
+        state[s]  = 1
+        stack     = [s]
+        nextEdges = [offsets[s]]
+
+        while stack:
+            v = stack[-1]
+            i = nextEdges[-1]
+
+            if i < offsets[v + 1]:
+                nextEdges[-1] = i + 1
+                w = neighbours[i]
+                if state[w] == 0:
+                    state[w] = 1
+                    stack.append(w)
+                    nextEdges.append(offsets[w])
+                elif state[w] == 1:
+                    raise CycleError((v, w))
+            else:
+                stack.pop()
+                nextEdges.pop()
+                state[v]      = 2
+                nodeOrder[v]  = currentLabel
+                currentLabel -= 1
+
+    return np.array(nodeOrder, dtype = csrGraph.indexDtype(n))
             
+#-------------------------------------------------------------------------------
+def topologicalLevels(G, durations = None):
+    """ Group the nodes of a DAG into levels using Kahn's algorithm.
+
+        Level 0 is the nodes with no incoming edges, and level k + 1 is the
+        nodes whose incoming edges are all from levels 0, ..., k. The nodes of
+        a level do not depend on each other, so they can all be run at once.
+        Each level is found with array operations: the in-degrees of the heads
+        of all edges out of the level are decremented together.
+
+        Args:
+          G:         Adjacency list of a graph, or a CSRGraph.
+          durations: Optional array of the time taken by each node. Default is
+                     None; if default is supplied each node takes 1.
+
+        Returns:
+          levels:             List of arrays of the nodes in each level.
+          criticalPathLength: Length of the longest path, the total duration
+                              of its nodes.
+
+        Raises:
+          CycleError: If the graph has a cycle.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        keys   = np.array(sorted(G.keys()))
+        levels, criticalPathLength = topologicalLevels(csrGraph.fromAdjList(G),
+                                                       durations)
+
+        # Drop labels missing from G, which become isolated nodes in the CSR
+        # graph.
+        levels = [level[np.in1d(level, keys)] for level in levels]
+        return [level for level in levels if len(level) > 0], criticalPathLength
+
+    n        = G.numNodes
+    inDegree = np.bincount(G.neighbours, minlength = n)
+
+    if durations is not None:
+        durations = np.asarray(durations, dtype = float)
+        start     = np.zeros(n)  # Earliest start time of each node
+
+    levels   = []
+    level    = np.flatnonzero(inDegree == 0).astype(G.neighbours.dtype)
+    numNodes = 0
+
+    while len(level) > 0:
+        levels.append(level)
+        numNodes += len(level)
+
+        # Heads of the edges out of the level, sorted and counted
+        degrees = G.offsets[level + 1] - G.offsets[level]
+        W       = csrGraph.gatherNeighbours(G, level)
+        order   = np.argsort(W, kind = 'quicksort')
+        W       = W[order]
+        starts  = np.flatnonzero(np.diff(np.r_[-1, W]))
+        heads   = W[starts]
+        counts  = np.diff(np.r_[starts, len(W)])
+
+        if durations is not None and len(W) > 0:
+            # A head can start once its latest predecessor has finished
+            V      = np.repeat(level, degrees)[order]
+            finish = np.maximum.reduceat(start[V] + durations[V], starts)
+            start[heads] = np.maximum(start[heads], finish)
+
+        inDegree[heads] -= counts
+        level = heads[inDegree[heads] == 0]
+
+    if numNodes < n:
+        topologicalOrderArray(G)  # Raises CycleError with a back edge
+
+    if durations is None:
+        criticalPathLength = len(levels)
+    elif n > 0:
+        criticalPathLength = (start + durations).max()
+    else:
+        criticalPathLength = 0.0
+
+    return levels, criticalPathLength
+
+#-------------------------------------------------------------------------------
+def articulationPointsAndBridges(G):
+    """ Find the articulation points and bridges of an undirected graph.
+
+        An articulation point is a node, and a bridge an edge, whose removal
+        disconnects its connected component. They are found in one depth
+        first search with an explicit stack, by the low-link of each node:
+        the earliest discovery time reached from its DFS subtree through at
+        most one back edge. Tree edge (u, v) is a bridge if low[v] > disc[u],
+        and u is an articulation point if low[v] >= disc[u] (for the root, if
+        it has more than one child). As in topologicalOrderArray, the search
+        runs on the CSR arrays converted to lists, and only the results are
+        made arrays.
+
+        Args:
+          G: Adjacency list of an undirected graph, or a CSRGraph, with each
+             edge stored in both directions.
+
+        Returns:
+          points:  Sorted array of articulation points.
+          bridges: Array of shape (# bridges, 2), each row a bridge (u, v)
+                   with u the parent of v in the DFS.
+
+        Raises:
+          None.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        G = csrGraph.fromAdjList(G)
+
+    n          = G.numNodes
+    offsets    = G.offsets.tolist()
+    neighbours = G.neighbours.tolist()
+
+    disc    = [-1] * n  # Discovery times
+    low     = [0] * n   # Low-links
+    isPoint = [False] * n
+    bridges = []
+
+    time = 0
+
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+
+        disc[root]   = low[root] = time
+        time        += 1
+        rootChildren = 0
+
+        # Stack of nodes, the position of the next edge to follow from each,
+        # and whether the edge back to its parent has been skipped. Only one
+        # copy of that edge is skipped, so a parallel edge still counts as a
+        # back edge.
+        stack     = [root]
+        nextEdges = [offsets[root]]
+        skipped   = [True]  # The root has no parent
+
+        while stack:
+            v = stack[-1]
+            i = nextEdges[-1]
+
+            if i < offsets[v + 1]:
+                nextEdges[-1] = i + 1
+                w = neighbours[i]
+
+                if disc[w] < 0:
+                    # Tree edge
+                    disc[w] = low[w] = time
+                    time   += 1
+                    stack.append(w)
+                    nextEdges.append(offsets[w])
+                    skipped.append(False)
+                    if len(stack) == 2:
+                        rootChildren += 1
+                elif not skipped[-1] and w == stack[-2]:
+                    skipped[-1] = True  # The tree edge back to the parent
+                elif disc[w] < low[v]:
+                    low[v] = disc[w]    # Back edge
+            else:
+                # v is finished, pass its low-link up to its parent u
+                stack.pop()
+                nextEdges.pop()
+                skipped.pop()
+                if stack:
+                    u = stack[-1]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                    if low[v] > disc[u]:
+                        bridges.append((u, v))
+                    if len(stack) > 1 and low[v] >= disc[u]:
+                        isPoint[u] = True
+
+        if rootChildren > 1:
+            isPoint[root] = True
+
+    points  = np.flatnonzero(isPoint)
+    bridges = np.array(bridges, dtype = G.neighbours.dtype).reshape(-1, 2)
+
+    return points, bridges
+
+#-------------------------------------------------------------------------------
+def articulationPoints(G):
+    """ Return the sorted array of articulation points of an undirected
+        graph, see articulationPointsAndBridges.
+    """
+
+    return articulationPointsAndBridges(G)[0]
+
+#-------------------------------------------------------------------------------
+def bridges(G):
+    """ Return the array of bridges of an undirected graph, one per row, see
+        articulationPointsAndBridges.
+    """
+
+    return articulationPointsAndBridges(G)[1]
+
+#-------------------------------------------------------------------------------
+class DynamicTopologicalOrder:
+    """ A topological order of a DAG, kept up to date as edges are inserted,
+        using the algorithm of Pearce and Kelly.
+
+        Inserting an edge (x, y) with x already before y changes nothing. If
+        y is before x, the nodes reachable from y which are not after x, and
+        the nodes reaching x which are not before y, are the only ones out of
+        order. Their labels are pooled and handed back with the nodes reaching
+        x first. An edge which would make a cycle is rejected, and the graph
+        and order are left unchanged.
+    """
+
+    def __init__(self, G, nodeOrder = None):
+        """ Args:
+              G:         Adjacency list of a DAG, or a CSRGraph.
+              nodeOrder: Order of the nodes, as returned by
+                         topologicalOrder(G). Default is None; if default is
+                         supplied it is computed.
+        """
+
+        if nodeOrder is None:
+            nodeOrder = topologicalOrder(G)
+
+        self.G         = G
+        self.nodeOrder = nodeOrder
+
+        if isinstance(G, csrGraph.CSRGraph):
+            self.Grev = G.transpose()
+        else:
+            self.Grev = collections.defaultdict(list)
+            for v in G:
+                for w in G[v]:
+                    self.Grev[w].append(v)
+
+        # Nodes at the other end of the edges inserted at each node
+        self.addedOut = collections.defaultdict(list)
+        self.addedIn  = collections.defaultdict(list)
+        self.nodesReordered = 0
+
+
+    def adjacent(self, v, graph, added):
+        """ Return the nodes joined to v in graph or by an inserted edge. """
+
+        if isinstance(graph, csrGraph.CSRGraph):
+            nodes = graph.neighbourList(v).tolist()
+        else:
+            nodes = list(graph.get(v, ()))
+
+        return nodes + added.get(v, [])
+
+
+    def search(self, s, graph, added, inRange):
+        """ Return the nodes reached from s through nodes in range.
+
+            Args:
+              s:       Start node.
+              graph:   Graph to search, G or its transpose.
+              added:   Inserted edges in the direction of graph.
+              inRange: Function of a label, True if the search may visit a
+                       node with that label.
+
+            Returns:
+              reached: List of the nodes reached, including s.
+        """
+
+        reached = set([s])
+        stack   = [s]
+
+        while stack:
+            v = stack.pop()
+            for w in self.adjacent(v, graph, added):
+                if w not in reached and inRange(self.nodeOrder[w]):
+                    reached.add(w)
+                    stack.append(w)
+
+        return list(reached)
+
+
+    def insertEdge(self, x, y):
+        """ Insert edge (x, y) and reorder the nodes it puts out of order.
+
+            Raises:
+              CycleError: If the edge would make a cycle. It is not inserted.
+        """
+
+        lower = self.nodeOrder[y]
+        upper = self.nodeOrder[x]
+
+        if lower > upper:
+            self.addedOut[x].append(y)
+            self.addedIn[y].append(x)
+            return  # Already in order
+
+        # Nodes reachable from y which are not after x; x among them means
+        # the edge closes a cycle.
+        forward = self.search(y, self.G, self.addedOut,
+                              lambda label: label <= upper)
+        if x in forward:
+            raise CycleError((x, y))
+
+        # Nodes reaching x which are not before y
+        backward = self.search(x, self.Grev, self.addedIn,
+                               lambda label: label >= lower)
+
+        self.addedOut[x].append(y)
+        self.addedIn[y].append(x)
+
+        # Hand the pooled labels back, the nodes reaching x first, each
+        # group keeping its own order.
+        forward.sort(key = lambda v: self.nodeOrder[v])
+        backward.sort(key = lambda v: self.nodeOrder[v])
+        nodes  = backward + forward
+        labels = sorted(self.nodeOrder[v] for v in nodes)
+
+        for v, label in zip(nodes, labels):
+            self.nodeOrder[v] = label
+        self.nodesReordered += len(nodes)
+
+
+    def insertEdges(self, edges):
+        """ Insert each edge (x, y) of an iterable in turn.
+
+            Raises:
+              CycleError: At the first edge which would make a cycle. The
+                          edges before it remain inserted.
+        """
+
+        for x, y in edges:
+            self.insertEdge(x, y)
+
+
 #-------------------------------------------------------------------------------
 def main(args):
     """ Run main code.
@@ -190,12 +751,21 @@ def main(args):
     G[4] = [2, 3, 5]
     G[5] = [3, 4]
 
+    # Directed acyclic graph D, to order topologically
+    D    = {}
+    D[0] = [1, 2]
+    D[1] = [3]
+    D[2] = [4]
+    D[3] = [4, 5]
+    D[4] = [5]
+    D[5] = []
+
     # Start node
     s = 0
     exploredList = DFS(G, s)
     recursiveExp = dict.fromkeys(G.keys(), 0)  # Initialise as zero
     recursiveExp = DFSRecursive(G, s, recursiveExp)
-    nodeOrder = topologicalOrder(G)
+    nodeOrder = topologicalOrder(D)
     print exploredList
     print recursiveExp
     print nodeOrder
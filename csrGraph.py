@@ -0,0 +1,509 @@
+""" Compressed sparse row (CSR) representation of a graph.
+
+    A graph of n nodes and m edges is stored as two flat integer arrays:
+      offsets:    length n + 1, the out-edges of node v are stored in
+                  neighbours[offsets[v]:offsets[v + 1]].
+      neighbours: length m, the head node of each edge.
+    An optional weights array of length m holds a weight for each edge.
+
+    Graphs can be saved in a binary file, see writeBinary, and opened again
+    with numpy.memmap, see loadBinary, so large graphs are parsed from text
+    only once.
+
+    Nodes are labelled 0, ..., n - 1, so results of traversals can be stored in
+    dense arrays indexed by node rather than in dictionaries. Node labels which
+    are missing from the input (e.g. node 0 of a graph labelled from 1) become
+    isolated nodes.
+"""
+#===============================================================================
+import ctypes
+import multiprocessing.sharedctypes
+import numpy as np
+
+
+#===============================================================================
+# Binary file layout: the magic string, a header of HEADER_LENGTH little endian
+# uint64 values (version, numNodes, numEdges and the bytes per value of the
+# offsets, neighbours and weights arrays, 0 if there are no weights), then the
+# offsets, neighbours and weights arrays, each starting on an 8 byte boundary.
+MAGIC         = 'CSRGRAPH'
+VERSION       = 1
+HEADER_LENGTH = 6
+
+
+#===============================================================================
+class CSRGraph:
+    """ The CSR graph class.
+
+        Stores the graph in an offsets array and a neighbours array, using
+        int32 indices when they fit and int64 otherwise.
+    """
+
+    def __init__(self, offsets, neighbours, weights = None):
+        self.offsets    = offsets
+        self.neighbours = neighbours
+        self.weights    = weights
+        self.numNodes   = len(offsets) - 1
+        self.numEdges   = len(neighbours)
+        self.reverse    = None  # Transpose graph, built on demand
+        self.weightInfo = None  # Weight range, found on demand
+
+
+    def neighbourList(self, v):
+        """ Return the array of nodes adjacent to node v. """
+
+        return self.neighbours[self.offsets[v]:self.offsets[v + 1]]
+
+
+    def weightList(self, v):
+        """ Return the array of weights of the edges out of node v. """
+
+        return self.weights[self.offsets[v]:self.offsets[v + 1]]
+
+
+    def outDegree(self):
+        """ Return the array of out-degrees of every node. """
+
+        return np.diff(self.offsets)
+
+
+    def tails(self):
+        """ Return the tail node of every edge, aligned with neighbours. """
+
+        nodes = np.arange(self.numNodes, dtype = self.neighbours.dtype)
+
+        return np.repeat(nodes, self.outDegree())
+
+
+    def transpose(self):
+        """ Return the graph with every edge reversed.
+
+            The transpose is cached, so repeated calls are free.
+        """
+
+        if self.reverse is None:
+            self.reverse = fromEdges(self.neighbours, self.tails(),
+                                     self.numNodes, self.weights)
+            self.reverse.reverse = self
+
+        return self.reverse
+
+
+    def weightRange(self):
+        """ Return the smallest and largest edge weight, and whether every
+            weight is an integer.
+
+            The weights are scanned once and the result cached, so checks
+            repeated for every query are free. None is returned for a graph
+            without weights, and (0, 0, True) for one without edges.
+        """
+
+        if self.weightInfo is None and self.weights is not None:
+            if self.numEdges == 0:
+                self.weightInfo = (0, 0, True)
+            else:
+                isInteger       = np.all(self.weights == np.round(self.weights))
+                self.weightInfo = (self.weights.min(), self.weights.max(),
+                                   bool(isInteger))
+
+        return self.weightInfo
+
+
+    def toAdjList(self):
+        """ Return the graph as a dictionary adjacency list. """
+
+        G = {}
+        for v in range(self.numNodes):
+            G[v] = self.neighbourList(v).tolist()
+
+        return G
+
+
+#===============================================================================
+def indexDtype(maxValue):
+    """ Return the smallest integer type (int32 or int64) holding maxValue. """
+
+    if maxValue < np.iinfo(np.int32).max:
+        return np.int32
+    else:
+        return np.int64
+
+#-------------------------------------------------------------------------------
+def fromEdges(tails, heads, numNodes = None, weights = None):
+    """ Build a CSR graph from arrays of edge tails and heads.
+
+        The edges out of each node keep the order in which they were given.
+
+        Args:
+          tails:    Array of tail nodes, one per edge.
+          heads:    Array of head nodes, one per edge.
+          numNodes: Number of nodes. Default is None; if default is supplied it
+                    is inferred as the largest node label + 1.
+          weights:  Optional array of edge weights.
+
+        Returns:
+          G: CSRGraph of the edges.
+
+        Raises:
+          None.
+    """
+
+    tails = np.asarray(tails, dtype = np.int64)
+    heads = np.asarray(heads, dtype = np.int64)
+
+    if numNodes is None:
+        if len(tails) > 0:
+            numNodes = int(max(tails.max(), heads.max())) + 1
+        else:
+            numNodes = 0
+
+    order      = stableOrder(tails, numNodes)
+    neighbours = heads[order].astype(indexDtype(numNodes))
+
+    offsets     = np.zeros(numNodes + 1, dtype = indexDtype(len(heads)))
+    offsets[1:] = np.cumsum(np.bincount(tails, minlength = numNodes))
+
+    if weights is not None:
+        weights = np.asarray(weights)[order]
+
+    return CSRGraph(offsets, neighbours, weights)
+
+#-------------------------------------------------------------------------------
+def stableOrder(keys, numKeys):
+    """ Return the permutation sorting keys, keeping the order of equal keys.
+
+        numpy's stable argsort is slow for large arrays, so when it fits in 64
+        bits the key and position are packed into one integer and sorted by
+        value instead.
+
+        Args:
+          keys:    Array of integer keys in the range [0, numKeys).
+          numKeys: Number of possible key values.
+
+        Returns:
+          order: Array of indices such that keys[order] is sorted.
+
+        Raises:
+          None.
+    """
+
+    m = len(keys)
+
+    if m == 0 or np.all(keys[:-1] <= keys[1:]):
+        return np.arange(m, dtype = np.int64)  # Already sorted
+    elif numKeys * m < np.iinfo(np.int64).max:
+        packed = np.sort(keys * m + np.arange(m, dtype = np.int64))
+        return packed % m
+    else:
+        return np.argsort(keys, kind = 'mergesort')
+
+#-------------------------------------------------------------------------------
+def fromAdjList(G):
+    """ Build a CSR graph from a dictionary adjacency list.
+
+        Args:
+          G: Adjacency list with integer keys. Values are lists of adjacent
+             nodes, None for no adjacent nodes, or dictionaries of adjacent
+             nodes to edge weights.
+
+        Returns:
+          G: CSRGraph of the adjacency list.
+
+        Raises:
+          None.
+    """
+
+    keys      = sorted(G.keys())
+    degrees   = []
+    heads     = []
+    weights   = []
+    weighted  = False
+
+    for key in keys:
+        value = G[key]
+        if value is None:
+            value = []
+        if isinstance(value, dict):
+            weighted = True
+            weights.extend(value.values())
+        heads.extend(value)  # Iterating a dictionary gives its keys
+        degrees.append(len(value))
+
+    tails    = np.repeat(np.array(keys, dtype = np.int64), degrees)
+    numNodes = max(keys + heads) + 1 if keys else 0
+
+    if weighted:
+        weights = np.array(weights, dtype = float)
+        return fromEdges(tails, heads, numNodes, weights)
+    else:
+        return fromEdges(tails, heads, numNodes)
+
+#-------------------------------------------------------------------------------
+def readAdjacencyList(lines):
+    """ Build a CSR graph from the lines of an adjacency list file.
+
+        Each line holds a node followed by the nodes adjacent to it. The lines
+        are parsed one at a time, so no per-edge Python objects are kept.
+
+        Args:
+          lines: Iterable of lines, e.g. an open file.
+
+        Returns:
+          G: CSRGraph of the adjacency list.
+
+        Raises:
+          None.
+    """
+
+    keys    = []
+    degrees = []
+    rows    = []
+
+    for line in lines:
+        row = np.fromstring(line, dtype = np.int64, sep = ' ')
+        if len(row) > 0:
+            keys.append(row[0])
+            degrees.append(len(row) - 1)
+            rows.append(row[1:])
+
+    tails = np.repeat(np.array(keys, dtype = np.int64), degrees)
+    if rows:
+        heads = np.concatenate(rows)
+    else:
+        heads = np.zeros(0, dtype = np.int64)
+
+    return fromEdges(tails, heads)
+
+#-------------------------------------------------------------------------------
+def readEdgeList(inputFile, weighted = False, header = False):
+    """ Build a CSR graph from an edge list file.
+
+        Each line holds the tail and head of an edge, followed by its weight if
+        weighted. The whole file is parsed by numpy in one call, with no
+        per-edge Python objects.
+
+        Args:
+          inputFile: The input file name and location.
+          weighted:  If True the third column holds edge weights. Default is
+                     False.
+          header:    If True the first line (e.g. the node and edge counts) is
+                     skipped. Default is False.
+
+        Returns:
+          G: CSRGraph of the edge list.
+
+        Raises:
+          IOError: If the file cannot be opened.
+    """
+
+    numColumns = 3 if weighted else 2
+    dtype      = float if weighted else np.int64
+
+    values = np.fromfile(inputFile, dtype = dtype, sep = ' ')
+    if header:
+        with open(inputFile, 'r') as inF:
+            values = values[len(inF.readline().split()):]
+
+    edges = values.reshape(-1, numColumns)
+    tails = edges[:, 0].astype(np.int64)
+    heads = edges[:, 1].astype(np.int64)
+
+    if weighted:
+        return fromEdges(tails, heads, weights = edges[:, 2].copy())
+    else:
+        return fromEdges(tails, heads)
+
+#-------------------------------------------------------------------------------
+def writeBinary(G, outputFile):
+    """ Write a CSR graph to a binary file which loadBinary can memory map.
+
+        Args:
+          G:          CSRGraph.
+          outputFile: The output file name and location.
+
+        Returns:
+          None.
+
+        Raises:
+          IOError: If the file cannot be opened.
+    """
+
+    arrays = [np.asarray(G.offsets).astype(G.offsets.dtype.newbyteorder('<')),
+              np.asarray(G.neighbours).astype(
+                  G.neighbours.dtype.newbyteorder('<'))]
+    if G.weights is not None:
+        arrays.append(np.asarray(G.weights).astype('<f8'))
+
+    header = [VERSION, G.numNodes, G.numEdges, arrays[0].itemsize,
+              arrays[1].itemsize, arrays[2].itemsize if len(arrays) > 2 else 0]
+
+    with open(outputFile, 'wb') as outF:
+        outF.write(MAGIC)
+        outF.write(np.array(header, dtype = '<u8').tostring())
+        for array in arrays:
+            outF.write(array.tostring())
+            outF.write('\0' * (-array.nbytes % 8))  # Pad to 8 bytes
+
+#-------------------------------------------------------------------------------
+def loadBinary(inputFile, mmap = True):
+    """ Open a CSR graph written by writeBinary.
+
+        Args:
+          inputFile: The input file name and location.
+          mmap:      If True the arrays are read-only numpy.memmap views of the
+                     file, so nothing is read until it is used. If False the
+                     arrays are read into memory. Default is True.
+
+        Returns:
+          G: CSRGraph of the file.
+
+        Raises:
+          IOError:    If the file cannot be opened.
+          ValueError: If the file is not a CSR graph file.
+    """
+
+    with open(inputFile, 'rb') as inF:
+        magic  = inF.read(len(MAGIC))
+        header = np.fromstring(inF.read(8 * HEADER_LENGTH), dtype = '<u8')
+
+    if magic != MAGIC or len(header) != HEADER_LENGTH or header[0] != VERSION:
+        raise ValueError(inputFile + ' is not a CSR graph file.')
+
+    numNodes, numEdges = int(header[1]), int(header[2])
+    shapes = [numNodes + 1, numEdges, numEdges]
+    dtypes = ['<i' + str(header[3]), '<i' + str(header[4]),
+              '<f' + str(header[5])]
+
+    arrays = []
+    offset = len(MAGIC) + 8 * HEADER_LENGTH
+    for iArray in range(3 if header[5] else 2):
+        nbytes = shapes[iArray] * int(header[3 + iArray])
+        if nbytes == 0:
+            array = np.zeros(0, dtype = dtypes[iArray])  # Cannot map 0 bytes
+        else:
+            array = np.memmap(inputFile, dtype = dtypes[iArray], mode = 'r',
+                              offset = offset, shape = (shapes[iArray],))
+            if not mmap:
+                array = np.array(array)
+        arrays.append(array)
+        offset += nbytes + (-nbytes % 8)
+
+    return CSRGraph(*arrays)
+
+#-------------------------------------------------------------------------------
+def textToBinary(inputFile, outputFile, fileFormat = 'adjacency', **options):
+    """ Convert a text graph file to a binary file which loadBinary can open.
+
+        Args:
+          inputFile:  The input file name and location.
+          outputFile: The output file name and location.
+          fileFormat: 'adjacency' for an adjacency list (see
+                      readAdjacencyList), or 'edges' for an edge list (see
+                      readEdgeList). Default is 'adjacency'.
+          options:    Keyword arguments passed on to readEdgeList, e.g.
+                      weighted and header.
+
+        Returns:
+          G: CSRGraph of the file.
+
+        Raises:
+          IOError:    If a file cannot be opened.
+          ValueError: If fileFormat is not recognised.
+    """
+
+    if fileFormat == 'adjacency':
+        with open(inputFile, 'r') as inF:
+            G = readAdjacencyList(inF)
+    elif fileFormat == 'edges':
+        G = readEdgeList(inputFile, **options)
+    else:
+        raise ValueError('Unknown graph file format: ' + str(fileFormat))
+
+    writeBinary(G, outputFile)
+
+    return G
+
+#-------------------------------------------------------------------------------
+def sharedArray(shape, dtype):
+    """ Return a zeroed numpy array in shared memory.
+
+        The memory is shared with processes forked after it is created, e.g.
+        the workers of a multiprocessing.Pool.
+    """
+
+    dtype  = np.dtype(dtype)
+    size   = int(np.prod(shape))
+    nbytes = max(size * dtype.itemsize, 1)  # RawArray needs at least 1 byte
+    buffer = multiprocessing.sharedctypes.RawArray(ctypes.c_char, nbytes)
+
+    return np.frombuffer(buffer, dtype = dtype, count = size).reshape(shape)
+
+#-------------------------------------------------------------------------------
+def toSharedMemory(G):
+    """ Return a copy of the CSR graph G with its arrays in shared memory. """
+
+    arrays = [G.offsets, G.neighbours]
+    if G.weights is not None:
+        arrays.append(G.weights)
+
+    shared = []
+    for array in arrays:
+        sharedCopy    = sharedArray(array.shape, array.dtype)
+        sharedCopy[:] = array
+        shared.append(sharedCopy)
+
+    sharedGraph            = CSRGraph(*shared)
+    sharedGraph.weightInfo = G.weightInfo
+
+    return sharedGraph
+
+#-------------------------------------------------------------------------------
+def edgeIndices(G, nodes):
+    """ Return the indices of all edges out of an array of nodes.
+
+        Args:
+          G:     CSRGraph.
+          nodes: Array of nodes.
+
+        Returns:
+          E: Array of indices into G.neighbours (and G.weights), listing the
+             edges out of nodes[0], then nodes[1], and so on.
+
+        Raises:
+          None.
+    """
+
+    starts  = G.offsets[nodes].astype(np.int64)
+    lengths = G.offsets[np.asarray(nodes) + 1] - starts
+
+    return rangeIndices(starts, lengths)
+
+#-------------------------------------------------------------------------------
+def rangeIndices(starts, lengths):
+    """ Concatenate the index ranges [starts[i], starts[i] + lengths[i]).
+
+        Args:
+          starts:  Array of range starts.
+          lengths: Array of range lengths.
+
+        Returns:
+          I: Array of the indices in each range, in order.
+
+        Raises:
+          None.
+    """
+
+    starts  = np.asarray(starts, dtype = np.int64)
+    lengths = np.asarray(lengths, dtype = np.int64)
+
+    # Position of each range's first index in the output array
+    outStarts = np.cumsum(lengths) - lengths
+
+    return (np.arange(lengths.sum(), dtype = np.int64) +
+            np.repeat(starts - outStarts, lengths))
+
+#-------------------------------------------------------------------------------
+def gatherNeighbours(G, nodes):
+    """ Return the concatenated adjacent nodes of an array of nodes. """
+
+    return G.neighbours[edgeIndices(G, nodes)]
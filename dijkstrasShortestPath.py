@@ -1,16 +1,27 @@
 """ Dijkstra's shortest path algorithm.
 
     Find the shortest path between a specified node and all other nodes in a
-    graph. Implemented using two Heaps. The Heap class comes from the heap.py
-    module.
+    graph. Implemented using a priority queue of nodes, the IndexedHeap class
+    from the heap.py module.
 
-    Improvement: Make heap implementation as a priority queue i.e. so each key
-    has a value attached, and there is a method to update key values. Add an
-    isEmpty method to the heap implementation as well.
+    dijkstra works on a weighted CSRGraph (see csrGraph.py) and returns
+    distance and predecessor arrays rather than a route list per node; routes
+    are rebuilt from the predecessors on demand by reconstructPath.
+
+    Single source to target queries can be answered without settling the
+    whole graph by bidirectionalDijkstra, or by aStar with a heuristic such as
+    euclideanHeuristic.
+
+    distanceMatrix runs dijkstra from many sources at once in a pool of
+    processes sharing the graph.
 """
 #===============================================================================
+import math
+import time
+import multiprocessing
 import numpy as np
 import heap
+import csrGraph
 
 #===============================================================================
 class Variables():
@@ -32,10 +43,11 @@ class Variables():
 
 
 #-------------------------------------------------------------------------------
-class HeapVariables(heap.Heap):
+class HeapVariables():
     
     def __init__(self, gGraph, sNode):
-        self.exploredNodes = [sNode]  # Region explored
+        self.exploredNodes = []  # Region explored, in the order explored
+        self.explored      = set()  # Region explored, for membership tests
         self.graphNodes    = gGraph.keys()  # Nodes in graph
         
         # Invariant 1, the heap has all vertices of the unexplored region.
@@ -43,18 +55,11 @@ class HeapVariables(heap.Heap):
         # (u, v) where u in the explored set of nodes and v is in the
         # unexplored set of nodes. Set to +inf if no such edge exists.
         self.key = {}
-        self.nodeToKey ={}  # Dictionary of nodes to keys. Only add in non-infs
-        keyArray = [np.inf] * (len(self.graphNodes) - 1)  # for not sNode
-        keyArray.append(0)  # for sNode
-        
         for iNode in gGraph.keys():
-            if iNode == sNode:
-                self.key[iNode] = 0
-                self.nodeToKey[0] = iNode
-            else:
-                self.key[iNode] = np.inf
+            self.key[iNode] = 0 if iNode == sNode else np.inf
 
-        self.unexploredHeap = heap.Heap(keyArray)
+        self.unexploredHeap = heap.IndexedHeap(
+            [(key, iNode) for iNode, key in self.key.iteritems()])
         
         
 #-------------------------------------------------------------------------------
@@ -91,34 +96,592 @@ def shortestPath(gGraph, sNode):
 
     variables = HeapVariables(gGraph, sNode)
     
-    while variables.unexploredHeap.heap != []:
+    while len(variables.unexploredHeap) > 0:
 
-        # Choose the key from the heap with the lowest value.
-        wKey  = variables.unexploredHeap.extractMin()
-        wNode = variables.nodeToKey[wKey]  # Find the node with this key
+        # Choose the node from the heap with the lowest key.
+        wKey, wNode = variables.unexploredHeap.extractMin()
 
         # Update our list of explored nodes.
         variables.exploredNodes.append(wNode)
+        variables.explored.add(wNode)
         
         for vNode, wvLength in gGraph[wNode].iteritems():
-            if vNode not in variables.exploredNodes:
+            if (vNode not in variables.explored and
+                wKey + wvLength < variables.key[vNode]):
 
-                vKey = variables.key[vNode]
+                # Update the shortest path route using Dijkstra's greedy
+                # criteria, moving vNode up the heap.
+                variables.key[vNode] = wKey + wvLength
+                variables.unexploredHeap.decreaseKey(vNode, wKey + wvLength)
+                
+    return variables
 
-                # Delete the vKey from the heap
-                variables.unexploredHeap.delete(vKey)
+#-------------------------------------------------------------------------------
+def weightedGraph(G):
+    """ Return G as a CSRGraph, checking its edge weights.
 
-                # Update the shortest path route using Dijkstra's greedy
-                # criteria.
-                variables.key[vNode] = min(vKey, wKey + wvLength)
+        The weights are only scanned the first time a graph is checked (see
+        csrGraph.CSRGraph.weightRange), so the check costs nothing per query.
 
-                # Re-insert to the heap with a new key value.
-                variables.unexploredHeap.insert(variables.key[vNode])
+        Raises:
+          ValueError: If G has no edge weights or a negative edge weight.
+    """
 
-                # Update our dictionary of key-values to nodes.
-                variables.nodeToKey[variables.key[vNode]] = vNode
-                
-    return variables
+    if not isinstance(G, csrGraph.CSRGraph):
+        G = csrGraph.fromAdjList(G)
+
+    if G.weights is None:
+        raise ValueError('Graph has no edge weights')
+    if G.weightRange()[0] < 0:
+        raise ValueError('Graph has a negative edge weight')
+
+    return G
+
+#-------------------------------------------------------------------------------
+def dijkstra(G, s, target = None, counters = None, queue = 'binary'):
+    """ Find shortest path lengths from s with Dijkstra's algorithm.
+
+        Only discovered nodes are put in the heap, and a node's key is lowered
+        with decreaseKey when a shorter path to it is found. The edges of each
+        settled node are read as one slice of the CSR arrays.
+
+        For graphs with small non-negative integer edge lengths the binary
+        heap can be swapped for a bucket queue (heap.BucketQueue, Dial's
+        algorithm) or a radix heap (heap.RadixHeap), which rely on the keys
+        extracted never decreasing.
+
+        Args:
+          G:        Weighted CSRGraph of graph G, or an adjacency list of
+                    dictionaries of adjacent nodes to edge lengths.
+          s:        Node to start from.
+          target:   Node to stop at. Default is None; if default is supplied
+                    every node reachable from s is settled. Otherwise only the
+                    nodes no further than target are certain to be final.
+          counters: Optional dictionary; if supplied, the number of nodes
+                    settled is added to the key 'settled'.
+          queue:    Priority queue to use, 'binary' (heap.IndexedHeap),
+                    'dial' (heap.BucketQueue) or 'radix' (heap.RadixHeap).
+                    Default is 'binary'.
+
+        Returns:
+          dist: float array of the shortest path length to each node, inf if
+                unreachable.
+          pred: int array of the node before each node on its shortest path,
+                -1 for s and unreached nodes.
+
+        Raises:
+          ValueError: If G has no edge weights or a negative edge weight, if
+                      queue is unknown, if it is 'dial' or 'radix' and an
+                      edge weight is not an integer, or if it is 'dial' and
+                      the largest edge weight needs more than
+                      heap.MAX_BUCKETS buckets.
+    """
+
+    G = weightedGraph(G)
+
+    if counters is None:
+        counters = {}
+    counters.setdefault('settled', 0)
+
+    if queue not in ['binary', 'dial', 'radix']:
+        raise ValueError('Unknown queue: ' + str(queue))
+    minWeight, maxWeight, isInteger = G.weightRange()
+    if queue != 'binary' and not isInteger:
+        raise ValueError('Bucket queues need integer edge weights')
+    if queue == 'dial' and maxWeight + 1 > heap.MAX_BUCKETS:
+        raise ValueError('Edge weights too large for a bucket queue; ' +
+                         "use queue = 'radix'")
+
+    n          = G.numNodes
+    offsets    = G.offsets
+    neighbours = G.neighbours
+    weights    = G.weights
+
+    dist    = [np.inf] * n
+    pred    = [-1] * n
+    settled = [False] * n
+
+    dist[s] = 0.0
+    if queue == 'binary':
+        unsettled = heap.IndexedHeap([(0.0, s)])
+    elif queue == 'dial':
+        unsettled = heap.BucketQueue([(0.0, s)], int(maxWeight))
+    else:
+        unsettled = heap.RadixHeap([(0.0, s)])
+
+    while len(unsettled) > 0:
+        vDist, vNode = unsettled.extractMin()
+        settled[vNode] = True
+        counters['settled'] += 1
+
+        if vNode == target:
+            break
+
+        start, end = offsets[vNode], offsets[vNode + 1]
+        for wNode, vwLength in zip(neighbours[start:end].tolist(),
+                                   weights[start:end].tolist()):
+            if settled[wNode]:
+                continue
+
+            pathLength = vDist + vwLength
+            if pathLength < dist[wNode]:
+                if dist[wNode] == np.inf:
+                    unsettled.insert(pathLength, wNode)
+                else:
+                    unsettled.decreaseKey(wNode, pathLength)
+
+                dist[wNode] = pathLength
+                pred[wNode] = vNode
+
+    return np.array(dist), np.array(pred, dtype = np.int64)
+
+#-------------------------------------------------------------------------------
+def benchmarkQueues(G, s):
+    """ Print the time taken by dijkstra from s with each priority queue.
+
+        Args:
+          G: CSRGraph of graph G with integer edge weights.
+          s: Node to start from.
+
+        Returns:
+          times: Dictionary of queue to time taken in seconds.
+
+        Raises:
+          ValueError: If the queues disagree on a shortest path length.
+    """
+
+    times = {}
+    dist  = None
+
+    for queue in ['binary', 'dial', 'radix']:
+        startTime = time.time()
+        queueDist, pred = dijkstra(G, s, queue = queue)
+        times[queue] = time.time() - startTime
+
+        if dist is not None and np.any(queueDist != dist):
+            raise ValueError('Shortest path lengths differ')
+        dist = queueDist
+
+        print queue, ':', times[queue], 's'
+
+    return times
+
+#-------------------------------------------------------------------------------
+# Graph, distance matrix and options shared with the distanceMatrix workers
+workerState = {}
+
+def initDistanceMatrixWorker(G, matrix, targets, queue):
+    """ Store the shared graph and distance matrix in a distanceMatrix worker.
+    """
+
+    workerState['G']       = G
+    workerState['matrix']  = matrix
+    workerState['targets'] = targets
+    workerState['queue']   = queue
+
+#-------------------------------------------------------------------------------
+def distanceRows(task):
+    """ Fill the distance matrix rows of a chunk of sources.
+
+        Run in a distanceMatrix worker process. The rows are written straight
+        into the shared matrix.
+
+        Args:
+          task: Tuple of the first row of the chunk and its sources.
+
+        Returns:
+          numRows: Number of rows filled.
+    """
+
+    firstRow, sources = task
+
+    G       = workerState['G']
+    matrix  = workerState['matrix']
+    targets = workerState['targets']
+
+    for iRow, s in enumerate(sources):
+        dist, pred = dijkstra(G, s, queue = workerState['queue'])
+        matrix[firstRow + iRow] = dist[targets]
+
+    return len(sources)
+
+#-------------------------------------------------------------------------------
+def distanceMatrix(G, sources, targets = None, numWorkers = None,
+                   chunkSize = None, progress = False, queue = 'binary'):
+    """ Find the shortest path lengths from many sources to many targets.
+
+        The graph and the matrix are put in shared memory, and chunks of
+        sources are handed to a pool of processes, each running dijkstra
+        from every source of its chunk and writing the row of distances to
+        the targets into the matrix.
+
+        Args:
+          G:          Weighted CSRGraph of graph G, or an adjacency list of
+                      dictionaries of adjacent nodes to edge lengths.
+          sources:    List or array of nodes to start from.
+          targets:    List or array of nodes to end at. Default is None; if
+                      default is supplied every node is a target.
+          numWorkers: Number of worker processes. Default is None; if default
+                      is supplied the number of CPUs is used.
+          chunkSize:  Number of sources handed to a worker at a time. Default
+                      is None; if default is supplied each worker gets about
+                      4 chunks, so faster workers can take on more.
+          progress:   If True print the number of rows done after each
+                      chunk. Default is False.
+          queue:      Priority queue for dijkstra. Default is 'binary'.
+
+        Returns:
+          matrix: float array of shape (len(sources), len(targets)) of the
+                  shortest path lengths, inf if unreachable.
+
+        Raises:
+          ValueError: If G has no edge weights or a negative edge weight.
+    """
+
+    G = weightedGraph(G)
+
+    if numWorkers is None:
+        numWorkers = multiprocessing.cpu_count()
+
+    sources = np.asarray(sources, dtype = np.int64)
+    if targets is None:
+        targets = np.arange(G.numNodes)
+    targets = np.asarray(targets, dtype = np.int64)
+
+    if chunkSize is None:
+        chunkSize = max(1, len(sources) // (4 * numWorkers))
+
+    matrix = csrGraph.sharedArray((len(sources), len(targets)), float)
+    tasks  = [(iRow, sources[iRow:iRow + chunkSize])
+              for iRow in range(0, len(sources), chunkSize)]
+
+    pool = multiprocessing.Pool(numWorkers, initDistanceMatrixWorker,
+                                (csrGraph.toSharedMemory(G), matrix, targets,
+                                 queue))
+    try:
+        rowsDone = 0
+        for numRows in pool.imap_unordered(distanceRows, tasks):
+            rowsDone += numRows
+            if progress:
+                print 'Rows done:', rowsDone, '/', len(sources)
+    finally:
+        pool.close()
+        pool.join()
+
+    return np.array(matrix)
+
+#-------------------------------------------------------------------------------
+def reconstructPath(pred, s, t):
+    """ Return the shortest path from s to t as a list of nodes.
+
+        Args:
+          pred: Predecessor array from dijkstra.
+          s:    Node the search started from.
+          t:    Node to end at.
+
+        Returns:
+          path: List of nodes from s to t, empty if t was not reached.
+
+        Raises:
+          None.
+    """
+
+    path = [t]
+    while path[-1] != s:
+        if pred[path[-1]] < 0:
+            return []
+        path.append(int(pred[path[-1]]))
+
+    return path[::-1]
+
+#-------------------------------------------------------------------------------
+def bidirectionalDijkstra(G, s, t, counters = None):
+    """ Find a shortest path from s to t with bidirectional Dijkstra.
+
+        Dijkstra's algorithm is run forwards from s on G and backwards from t
+        on its transpose, each step settling the node with the smaller key of
+        the two heaps. Every edge relaxed into a node reached by the other
+        search gives a path from s to t; the search stops once the two smallest
+        keys add up to at least the shortest of these. Distances are kept in
+        dictionaries, so the work done grows with the nodes reached rather
+        than the size of the graph.
+
+        Args:
+          G:        Weighted CSRGraph of graph G, or an adjacency list of
+                    dictionaries of adjacent nodes to edge lengths.
+          s:        start node.
+          t:        target node.
+          counters: Optional dictionary; if supplied, the number of nodes
+                    settled by the two searches is added to the key 'settled'.
+
+        Returns:
+          dist: length of a shortest path from s to t, or inf if t cannot be
+                reached from s.
+          path: list of nodes on a shortest path from s to t, or an empty list
+                if t cannot be reached from s.
+
+        Raises:
+          ValueError: If G has no edge weights or a negative edge weight.
+    """
+
+    G = weightedGraph(G)
+
+    if counters is None:
+        counters = {}
+    counters.setdefault('settled', 0)
+
+    if s == t:
+        return 0.0, [s]
+
+    # Forward search on G from s, backward search on the transpose from t
+    graphs  = [G, G.transpose()]
+    dist    = [{s: 0.0}, {t: 0.0}]
+    pred    = [{s: -1}, {t: -1}]
+    settled = [set(), set()]
+    heaps   = [heap.IndexedHeap([(0.0, s)]), heap.IndexedHeap([(0.0, t)])]
+
+    bestDist = np.inf
+    meetNode = -1
+
+    while len(heaps[0]) > 0 and len(heaps[1]) > 0:
+        minKeys = [heaps[0].peekMin()[0], heaps[1].peekMin()[0]]
+        if minKeys[0] + minKeys[1] >= bestDist:
+            break
+
+        side  = int(minKeys[1] < minKeys[0])
+        other = 1 - side
+
+        vDist, vNode = heaps[side].extractMin()
+        settled[side].add(vNode)
+        counters['settled'] += 1
+
+        offsets = graphs[side].offsets
+        start, end = offsets[vNode], offsets[vNode + 1]
+        for wNode, vwLength in zip(graphs[side].neighbours[start:end].tolist(),
+                                   graphs[side].weights[start:end].tolist()):
+            if wNode in settled[side]:
+                continue
+
+            pathLength = vDist + vwLength
+            if pathLength < dist[side].get(wNode, np.inf):
+                if wNode in heaps[side]:
+                    heaps[side].decreaseKey(wNode, pathLength)
+                else:
+                    heaps[side].insert(pathLength, wNode)
+
+                dist[side][wNode] = pathLength
+                pred[side][wNode] = vNode
+
+            if pathLength + dist[other].get(wNode, np.inf) < bestDist:
+                bestDist = pathLength + dist[other][wNode]
+                meetNode = wNode
+
+    if meetNode < 0:
+        return np.inf, []
+
+    # Walk back to s and on to t along the predecessors
+    path = [meetNode]
+    while path[0] != s:
+        path.insert(0, pred[0][path[0]])
+    while path[-1] != t:
+        path.append(pred[1][path[-1]])
+
+    return bestDist, path
+
+#-------------------------------------------------------------------------------
+def euclideanHeuristic(coords, t):
+    """ Return the straight line distance heuristic to node t for aStar.
+
+        The heuristic is admissible when no edge is shorter than the straight
+        line between its nodes.
+
+        Args:
+          coords: Array of the coordinates of each node, one row per node.
+          t:      target node.
+
+        Returns:
+          heuristic: Function of a node returning its straight line distance
+                     to t.
+
+        Raises:
+          None.
+    """
+
+    target = np.asarray(coords[t], dtype = float).tolist()
+
+    def heuristic(v):
+        return math.sqrt(sum((x - y) ** 2
+                             for x, y in zip(coords[v].tolist(), target)))
+
+    return heuristic
+
+#-------------------------------------------------------------------------------
+def aStar(G, s, t, heuristic = None, counters = None):
+    """ Find a shortest path from s to t with A* search.
+
+        Dijkstra's algorithm with each node keyed by its distance from s plus
+        the heuristic's estimate of its distance to t, so the search heads
+        towards t. With an admissible heuristic (one never over-estimating the
+        distance to t) the path found is a shortest one; a node reached again
+        by a shorter path is put back in the heap, so the heuristic need not
+        also be consistent.
+
+        Args:
+          G:         Weighted CSRGraph of graph G, or an adjacency list of
+                     dictionaries of adjacent nodes to edge lengths.
+          s:         start node.
+          t:         target node.
+          heuristic: Function of a node returning a lower bound on its
+                     distance to t, e.g. from euclideanHeuristic. Default is
+                     None; if default is supplied the bound is 0, which is
+                     Dijkstra's algorithm.
+          counters:  Optional dictionary; if supplied, the number of nodes
+                     settled is added to the key 'settled'.
+
+        Returns:
+          dist: length of a shortest path from s to t, or inf if t cannot be
+                reached from s.
+          path: list of nodes on a shortest path from s to t, or an empty list
+                if t cannot be reached from s.
+
+        Raises:
+          ValueError: If G has no edge weights or a negative edge weight.
+    """
+
+    G = weightedGraph(G)
+
+    if heuristic is None:
+        heuristic = lambda v: 0.0
+    if counters is None:
+        counters = {}
+    counters.setdefault('settled', 0)
+
+    offsets    = G.offsets
+    neighbours = G.neighbours
+    weights    = G.weights
+
+    dist     = {s: 0.0}
+    pred     = {s: -1}
+    estimate = {}  # Cache of the heuristic of each node reached
+    frontier = heap.IndexedHeap([(heuristic(s), s)])
+
+    while len(frontier) > 0:
+        vKey, vNode = frontier.extractMin()
+        counters['settled'] += 1
+
+        if vNode == t:
+            path = [t]
+            while path[0] != s:
+                path.insert(0, pred[path[0]])
+
+            return dist[t], path
+
+        vDist = dist[vNode]
+        start, end = offsets[vNode], offsets[vNode + 1]
+        for wNode, vwLength in zip(neighbours[start:end].tolist(),
+                                   weights[start:end].tolist()):
+            pathLength = vDist + vwLength
+            if pathLength < dist.get(wNode, np.inf):
+                if wNode not in estimate:
+                    estimate[wNode] = heuristic(wNode)
+
+                key = pathLength + estimate[wNode]
+                if wNode in frontier:
+                    frontier.decreaseKey(wNode, key)
+                else:
+                    frontier.insert(key, wNode)
+
+                dist[wNode] = pathLength
+                pred[wNode] = vNode
+
+    return np.inf, []
+
+#-------------------------------------------------------------------------------
+def gridGraph(numRows, numCols, seed = None):
+    """ Generate a road-like test graph: a grid with jittered node positions.
+
+        Nodes are joined to their neighbours across and down the grid in both
+        directions, with edge lengths of 1 to 2 times the straight line
+        distance, so euclideanHeuristic is admissible.
+
+        Args:
+          numRows: Number of rows of nodes.
+          numCols: Number of columns of nodes.
+          seed:    Seed for the random number generator. Default is None.
+
+        Returns:
+          G:      Weighted CSRGraph of the grid.
+          coords: float array of the (x, y) position of each node.
+
+        Raises:
+          None.
+    """
+
+    random = np.random.RandomState(seed)
+    nodes  = np.arange(numRows * numCols).reshape(numRows, numCols)
+
+    coords = np.column_stack([(nodes % numCols).ravel(),
+                              (nodes // numCols).ravel()]).astype(float)
+    coords += random.uniform(-0.3, 0.3, size = coords.shape)
+
+    tails = np.concatenate([nodes[:, :-1].ravel(), nodes[:-1, :].ravel()])
+    heads = np.concatenate([nodes[:, 1:].ravel(), nodes[1:, :].ravel()])
+    tails, heads = np.r_[tails, heads], np.r_[heads, tails]
+
+    lengths = np.sqrt(((coords[tails] - coords[heads]) ** 2).sum(axis = 1))
+    lengths *= random.uniform(1.0, 2.0, size = len(lengths))
+
+    return csrGraph.fromEdges(tails, heads, len(coords), lengths), coords
+
+#-------------------------------------------------------------------------------
+def benchmarkQueries(G, queries, coords = None):
+    """ Print the average time and nodes settled per query of dijkstra (with
+        early exit), bidirectionalDijkstra and, if coords are given, aStar
+        with euclideanHeuristic.
+
+        Args:
+          G:       Weighted CSRGraph of graph G.
+          queries: List of (s, t) pairs.
+          coords:  Optional array of the coordinates of each node.
+
+        Returns:
+          results: Dictionary of method to (seconds, nodes settled) per query.
+
+        Raises:
+          ValueError: If the methods disagree on a shortest path length.
+    """
+
+    methods = ['dijkstra', 'bidirectional']
+    if coords is not None:
+        methods.append('aStar')
+
+    results = {}
+    lengths = {}
+
+    for method in methods:
+        counters  = {'settled': 0}
+        startTime = time.time()
+
+        for s, t in queries:
+            if method == 'dijkstra':
+                dist, pred = dijkstra(G, s, t, counters)
+                length     = dist[t]
+            elif method == 'bidirectional':
+                length, path = bidirectionalDijkstra(G, s, t, counters)
+            else:
+                length, path = aStar(G, s, t,
+                                     euclideanHeuristic(coords, t), counters)
+
+            if abs(lengths.setdefault((s, t), length) - length) > 1e-9:
+                raise ValueError('Shortest path lengths differ')
+
+        results[method] = ((time.time() - startTime) / len(queries),
+                           counters['settled'] / float(len(queries)))
+
+        print method, ':', results[method][0], 's,', results[method][1], \
+              'nodes settled per query'
+
+    return results
 
 #===============================================================================
 def main():
@@ -9,7 +9,19 @@
       Deleting an element.
       Extract-Min.
       TODO: Implement heapify.
+
+    IndexedHeap is a min-heap of (priority, item) pairs which also keeps the
+    position of each item, so items can be found, deleted or have their
+    priority decreased in O(log n) rather than by searching the heap.
+
+    BucketQueue and RadixHeap share its interface for small integer
+    priorities which are extracted in increasing order, as in Dijkstra's
+    algorithm.
 """
+#===============================================================================
+MAX_BUCKETS = 2 ** 16  # Largest number of buckets a BucketQueue will allocate
+
+
 #===============================================================================
 class Heap:
     """ The min-Heap class.
@@ -185,6 +197,552 @@ class Heap:
                 self.bubbleDown(kNode, replaceKey)
 
 
+#===============================================================================
+class IndexedHeap:
+    """ The indexed min-Heap class, a priority queue of items.
+
+        The heap holds a priority for each item, kept in two lists, and a
+        dictionary of the position of each item in the lists. Every move of
+        an item updates its position, so an item never has to be searched
+        for. Items must be hashable and appear at most once.
+    """
+
+    def __init__(self, pairs = ()):
+        self.priorities = [priority for priority, item in pairs]
+        self.items      = [item for priority, item in pairs]
+        self.position   = dict((item, iNode)
+                               for iNode, item in enumerate(self.items))
+        self.heapify()
+
+
+    def __len__(self):
+        return len(self.items)
+
+
+    def __contains__(self, item):
+        return item in self.position
+
+
+    def contains(self, item):
+        """ Return True if item is in the heap. """
+
+        return item in self.position
+
+
+    def priority(self, item):
+        """ Return the priority of item, which must be in the heap. """
+
+        return self.priorities[self.position[item]]
+
+
+    def swap(self, iNode, jNode):
+        """ Swap the pairs at heap positions iNode and jNode. """
+
+        priorities, items = self.priorities, self.items
+
+        priorities[iNode], priorities[jNode] = (priorities[jNode],
+                                                priorities[iNode])
+        items[iNode], items[jNode] = items[jNode], items[iNode]
+
+        self.position[items[iNode]] = iNode
+        self.position[items[jNode]] = jNode
+
+
+    def bubbleUp(self, childNode):
+        """ Bubble-up child node until Heap property restored.
+
+            Parents are shifted down into the gap left by the node, which is
+            written once at its final position, rather than swapped.
+
+            Args:
+              childNode: The array index of the node to examine.
+        """
+
+        priorities, items, position = self.priorities, self.items, self.position
+        priority, item = priorities[childNode], items[childNode]
+
+        while childNode > 0:
+            parentNode = (childNode - 1) // 2
+            if priorities[parentNode] <= priority:
+                break
+
+            priorities[childNode] = priorities[parentNode]
+            items[childNode]      = items[parentNode]
+            position[items[childNode]] = childNode
+            childNode = parentNode
+
+        priorities[childNode] = priority
+        items[childNode]      = item
+        position[item]        = childNode
+
+
+    def bubbleDown(self, parentNode):
+        """ Bubble-down parent node until Heap property restored.
+
+            The smaller child is shifted up into the gap left by the node,
+            which is written once at its final position.
+
+            Args:
+              parentNode: The array index of the node to examine.
+        """
+
+        priorities, items, position = self.priorities, self.items, self.position
+        priority, item = priorities[parentNode], items[parentNode]
+        heapSize = len(priorities)
+
+        childNode = 2 * parentNode + 1
+        while childNode < heapSize:
+            # The smaller of the (up to) two children
+            if (childNode + 1 < heapSize and
+                priorities[childNode + 1] < priorities[childNode]):
+                childNode += 1
+
+            if priority <= priorities[childNode]:
+                break
+
+            priorities[parentNode] = priorities[childNode]
+            items[parentNode]      = items[childNode]
+            position[items[parentNode]] = parentNode
+            parentNode = childNode
+            childNode  = 2 * parentNode + 1
+
+        priorities[parentNode] = priority
+        items[parentNode]      = item
+        position[item]         = parentNode
+
+
+    def heapify(self):
+        """ Heapify the pairs, bubbling down from the last parent node. """
+
+        for iNode in range(len(self.items) // 2 - 1, -1, -1):
+            self.bubbleDown(iNode)
+
+
+    def insert(self, priority, item):
+        """ Insert item with the given priority.
+
+            Raises:
+              ValueError: If item is already in the heap.
+        """
+
+        if item in self.position:
+            raise ValueError('Item already in Heap')
+
+        self.priorities.append(priority)
+        self.items.append(item)
+        self.position[item] = len(self.items) - 1
+
+        self.bubbleUp(len(self.items) - 1)
+
+
+    def peekMin(self):
+        """ Return the (priority, item) pair of the root node, or None if the
+            heap is empty, leaving it in the heap.
+        """
+
+        if not self.items:
+            return None
+
+        return self.priorities[0], self.items[0]
+
+
+    def extractMin(self):
+        """ Extract the root node.
+
+            Returns:
+              root: (priority, item) pair of the root node.
+        """
+
+        if not self.items:
+            print 'Heap empty!'
+            return None
+
+        root = (self.priorities[0], self.items[0])
+        self.removeAt(0)
+
+        return root
+
+
+    def removeAt(self, iNode):
+        """ Remove the pair at heap position iNode. """
+
+        # Replace the node with the last leaf, delete the last leaf.
+        self.swap(iNode, len(self.items) - 1)
+        self.priorities.pop()
+        del self.position[self.items.pop()]
+
+        if iNode < len(self.items):
+            # At most one of these moves the node.
+            self.bubbleUp(iNode)
+            self.bubbleDown(iNode)
+
+
+    def decreaseKey(self, item, priority):
+        """ Lower the priority of an item in the heap.
+
+            Args:
+              item:     The item to update.
+              priority: Its new priority.
+
+            Raises:
+              ValueError: If priority is larger than the current priority.
+        """
+
+        if item not in self.position:
+            print 'Key not in Heap.'
+            return
+
+        iNode = self.position[item]
+        if priority > self.priorities[iNode]:
+            raise ValueError('New priority is larger than the current one')
+
+        self.priorities[iNode] = priority
+        self.bubbleUp(iNode)
+
+
+    def delete(self, item):
+        """ Delete an item from the heap.
+
+            Args:
+              item: Item to delete.
+        """
+
+        if item not in self.position:
+            print 'Key not in Heap.'
+        else:
+            self.removeAt(self.position[item])
+
+
+#===============================================================================
+class BucketQueue:
+    """ Dial's bucket queue, a priority queue of items with small integer
+        priorities.
+
+        Used by Dijkstra's algorithm, where the priorities extracted never
+        decrease and every priority in the queue is at most maxWeight (the
+        largest edge length) above the last extracted. A circular array of
+        maxWeight + 1 buckets then holds each priority in its own bucket, a
+        set of items, so insert, decreaseKey and delete are O(1) and
+        extractMin scans forward at most maxWeight empty buckets.
+
+        Raises:
+          ValueError: If maxWeight + 1 is more than MAX_BUCKETS buckets; a
+                      RadixHeap needs only O(log maxWeight) buckets.
+    """
+
+    def __init__(self, pairs = (), maxWeight = 1):
+        if int(maxWeight) + 1 > MAX_BUCKETS:
+            raise ValueError('maxWeight ' + str(maxWeight) + ' needs more ' +
+                             'than ' + str(MAX_BUCKETS) + ' buckets; ' +
+                             'use a RadixHeap instead')
+
+        self.numBuckets  = int(maxWeight) + 1
+        self.buckets     = [set() for iBucket in range(self.numBuckets)]
+        self.priorities  = {}  # Priority of each item
+
+        # Smallest priority the queue can hold, moved on by peekMin
+        self.minPriority = int(min([priority for priority, item in pairs] or
+                                   [0]))
+
+        for priority, item in pairs:
+            self.insert(priority, item)
+
+
+    def __len__(self):
+        return len(self.priorities)
+
+
+    def __contains__(self, item):
+        return item in self.priorities
+
+
+    def contains(self, item):
+        """ Return True if item is in the queue. """
+
+        return item in self.priorities
+
+
+    def priority(self, item):
+        """ Return the priority of item, which must be in the queue. """
+
+        return self.priorities[item]
+
+
+    def bucket(self, priority):
+        """ Return the bucket of a priority.
+
+            Raises:
+              ValueError: If priority is outside the range of the buckets.
+        """
+
+        if not (self.minPriority <= priority <
+                self.minPriority + self.numBuckets):
+            raise ValueError('Priority outside the range of the buckets')
+
+        return self.buckets[int(priority) % self.numBuckets]
+
+
+    def insert(self, priority, item):
+        """ Insert item with the given priority.
+
+            Raises:
+              ValueError: If item is already in the queue.
+        """
+
+        if item in self.priorities:
+            raise ValueError('Item already in Heap')
+
+        self.bucket(priority).add(item)
+        self.priorities[item] = priority
+
+
+    def peekMin(self):
+        """ Return the (priority, item) pair with the smallest priority, or
+            None if the queue is empty, leaving it in the queue. As for
+            extractMin, smaller priorities can no longer be inserted.
+        """
+
+        if not self.priorities:
+            return None
+
+        # Move past the empty buckets
+        while not self.buckets[self.minPriority % self.numBuckets]:
+            self.minPriority += 1
+
+        # Iterating a set scans from the start of its table, which fills
+        # with deleted entries, but pop resumes where it last stopped.
+        bucket = self.buckets[self.minPriority % self.numBuckets]
+        item   = bucket.pop()
+        bucket.add(item)
+
+        return self.priorities[item], item
+
+
+    def extractMin(self):
+        """ Extract the item with the smallest priority.
+
+            Returns:
+              root: (priority, item) pair of the item.
+        """
+
+        if not self.priorities:
+            print 'Heap empty!'
+            return None
+
+        while not self.buckets[self.minPriority % self.numBuckets]:
+            self.minPriority += 1
+
+        item = self.buckets[self.minPriority % self.numBuckets].pop()
+
+        return self.priorities.pop(item), item
+
+
+    def decreaseKey(self, item, priority):
+        """ Lower the priority of an item in the queue.
+
+            Args:
+              item:     The item to update.
+              priority: Its new priority.
+
+            Raises:
+              ValueError: If priority is larger than the current priority.
+        """
+
+        if item not in self.priorities:
+            print 'Key not in Heap.'
+            return
+
+        if priority > self.priorities[item]:
+            raise ValueError('New priority is larger than the current one')
+
+        self.bucket(self.priorities[item]).remove(item)
+        self.bucket(priority).add(item)
+        self.priorities[item] = priority
+
+
+    def delete(self, item):
+        """ Delete an item from the queue.
+
+            Args:
+              item: Item to delete.
+        """
+
+        if item not in self.priorities:
+            print 'Key not in Heap.'
+        else:
+            self.bucket(self.priorities.pop(item)).remove(item)
+
+
+#===============================================================================
+class RadixHeap:
+    """ The radix heap, a priority queue of items with non-negative integer
+        priorities.
+
+        Like BucketQueue it relies on the priorities extracted never
+        decreasing, but needs no bound on the edge lengths. Bucket i holds the
+        items whose priority first differs from the last extracted priority
+        in bit i - 1 (bucket 0 those equal to it), so there are only as many
+        buckets as bits. When bucket 0 is empty, the first non-empty bucket's
+        smallest priority becomes the last extracted, and its items are
+        spread over the lower buckets; each item moves down at most once per
+        bit, giving O(log C) amortised time per extractMin.
+    """
+
+    def __init__(self, pairs = ()):
+        self.buckets  = [{}]  # Each bucket is a dictionary item -> priority
+        self.position = {}  # Bucket of each item
+        self.lastMin  = 0
+
+        for priority, item in pairs:
+            self.insert(priority, item)
+
+
+    def __len__(self):
+        return len(self.position)
+
+
+    def __contains__(self, item):
+        return item in self.position
+
+
+    def contains(self, item):
+        """ Return True if item is in the heap. """
+
+        return item in self.position
+
+
+    def priority(self, item):
+        """ Return the priority of item, which must be in the heap. """
+
+        return self.buckets[self.position[item]][item]
+
+
+    def place(self, priority, item):
+        """ Put item in the bucket for its priority.
+
+            Raises:
+              ValueError: If priority is below the last extracted priority.
+        """
+
+        if priority < self.lastMin:
+            raise ValueError('Priority below the last extracted priority')
+
+        iBucket = (int(priority) ^ self.lastMin).bit_length()
+        while len(self.buckets) <= iBucket:
+            self.buckets.append({})
+
+        self.buckets[iBucket][item] = priority
+        self.position[item]         = iBucket
+
+
+    def insert(self, priority, item):
+        """ Insert item with the given priority.
+
+            Raises:
+              ValueError: If item is already in the heap.
+        """
+
+        if item in self.position:
+            raise ValueError('Item already in Heap')
+
+        self.place(priority, item)
+
+
+    def peekMin(self):
+        """ Return the (priority, item) pair with the smallest priority, or
+            None if the heap is empty, leaving it in the heap. As for
+            extractMin, smaller priorities can no longer be inserted.
+        """
+
+        if not self.position:
+            return None
+
+        self.fillFirstBucket()
+
+        # As for BucketQueue.peekMin, popitem avoids scanning deleted entries
+        item, priority = self.buckets[0].popitem()
+        self.buckets[0][item] = priority
+
+        return priority, item
+
+
+    def fillFirstBucket(self):
+        """ Refill an empty bucket 0 from the first non-empty bucket.
+
+            The smallest priority of that bucket becomes the last extracted,
+            and its items are spread over the lower buckets.
+        """
+
+        if self.buckets[0]:
+            return
+
+        iBucket = 1
+        while not self.buckets[iBucket]:
+            iBucket += 1
+
+        bucket = self.buckets[iBucket]
+        self.buckets[0]       = {}
+        self.buckets[iBucket] = {}
+        self.lastMin = int(min(bucket.itervalues()))
+
+        for item, priority in bucket.iteritems():
+            self.place(priority, item)
+
+
+    def extractMin(self):
+        """ Extract the item with the smallest priority.
+
+            Returns:
+              root: (priority, item) pair of the item.
+        """
+
+        if not self.position:
+            print 'Heap empty!'
+            return None
+
+        self.fillFirstBucket()
+
+        item, priority = self.buckets[0].popitem()
+        del self.position[item]
+
+        return priority, item
+
+
+    def decreaseKey(self, item, priority):
+        """ Lower the priority of an item in the heap.
+
+            Args:
+              item:     The item to update.
+              priority: Its new priority.
+
+            Raises:
+              ValueError: If priority is larger than the current priority.
+        """
+
+        if item not in self.position:
+            print 'Key not in Heap.'
+            return
+
+        if priority > self.priority(item):
+            raise ValueError('New priority is larger than the current one')
+
+        del self.buckets[self.position[item]][item]
+        self.place(priority, item)
+
+
+    def delete(self, item):
+        """ Delete an item from the heap.
+
+            Args:
+              item: Item to delete.
+        """
+
+        if item not in self.position:
+            print 'Key not in Heap.'
+        else:
+            del self.buckets[self.position.pop(item)][item]
+
+
 #===============================================================================
 def main():
     A = [13, 11, 9, 12, 4, 9, 8, 4, 4]
@@ -0,0 +1,249 @@
+""" All pairs shortest paths with negative edge lengths, by Johnson's algorithm.
+
+    Bellman-Ford from a virtual source joined to every node by a zero length
+    edge gives each node a potential h. Reweighting every edge (u, v) to
+    w(u, v) + h(u) - h(v) makes all lengths non-negative while changing every
+    path from s to t by the same h(s) - h(t), so Dijkstra's algorithm (see
+    dijkstrasShortestPath) can then be run from each source in parallel.
+"""
+#===============================================================================
+import sys
+import numpy as np
+import csrGraph
+import dijkstrasShortestPath
+
+
+#===============================================================================
+class NegativeCycleError(ValueError):
+    """ Raised when shortest paths are undefined due to a negative cycle.
+
+        Attributes:
+          cycle: List of the nodes of a negative cycle, in order.
+    """
+
+    def __init__(self, cycle):
+        ValueError.__init__(self, 'Graph has a negative cycle through nodes ' +
+                            str(cycle) + '.')
+        self.cycle = cycle
+
+
+#===============================================================================
+def readInput(inputFile):
+    """ Read a weighted directed graph from an edge list file.
+
+        The first line holds the number of nodes and edges, and each line
+        after it the tail, head and length of an edge.
+
+        Args:
+          inputFile: The input file name and location.
+
+        Returns:
+          G: Weighted CSRGraph of the edges.
+
+        Raises:
+          IOError: If the file cannot be opened.
+    """
+
+    try:
+        G = csrGraph.readEdgeList(inputFile, weighted = True, header = True)
+    except IOError:
+        print 'Cannot open', inputFile
+        return 1
+
+    return G
+
+#-------------------------------------------------------------------------------
+def bellmanFord(G, s = None):
+    """ Find shortest path lengths from s with the Bellman-Ford algorithm.
+
+        Each round relaxes every edge at once: the candidate lengths
+        dist[u] + w(u, v) are grouped by head on the transpose graph and
+        reduced to their minimum with np.minimum.reduceat. The rounds stop
+        early once one changes nothing.
+
+        Args:
+          G: Weighted CSRGraph of graph G, or an adjacency list of
+             dictionaries of adjacent nodes to edge lengths.
+          s: Node to start from. Default is None; if default is supplied the
+             search starts from a virtual node with a zero length edge to
+             every node, as used by johnson.
+
+        Returns:
+          dist: float array of the shortest path length to each node, inf if
+                unreachable.
+          pred: int array of the node before each node on its shortest path,
+                -1 for s and unreached nodes.
+
+        Raises:
+          ValueError:         If G has no edge weights.
+          NegativeCycleError: If a negative cycle is reachable from s.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        G = csrGraph.fromAdjList(G)
+    if G.weights is None:
+        raise ValueError('Graph has no edge weights')
+
+    n    = G.numNodes
+    Grev = G.transpose()
+
+    # Heads with in-edges, and where their in-edges start on the transpose
+    inDegree = Grev.outDegree()
+    heads    = np.flatnonzero(inDegree > 0)
+    starts   = Grev.offsets[heads]
+    edgeHead = np.repeat(heads, inDegree[heads])
+
+    if s is None:
+        dist = np.zeros(n)
+    else:
+        dist    = np.full(n, np.inf)
+        dist[s] = 0.0
+    pred = np.full(n, -1, dtype = np.int64)
+
+    # Scratch arrays for finding the new predecessors
+    isChanged = np.zeros(n, dtype = bool)
+    firstEdge = np.zeros(n, dtype = np.int64)
+
+    # Each round uses the lengths of the last, so after round k every node
+    # has its shortest length over paths of at most k edges. A node which
+    # still improves in round n has a shortest walk of n edges, which must
+    # go round a negative cycle.
+    for iRound in range(n):
+        if len(heads) == 0:
+            break
+
+        candidates = dist[Grev.neighbours] + Grev.weights
+        best       = np.minimum.reduceat(candidates, starts)
+
+        improved = best < dist[heads]
+        if not np.any(improved):
+            break
+
+        changed       = heads[improved]
+        dist[changed] = best[improved]
+
+        # The first edge into each changed head which gives its new length;
+        # assigned in reverse so the first such edge is written last.
+        isChanged[changed] = True
+        edges = np.flatnonzero(candidates == dist[edgeHead])
+        edges = edges[isChanged[edgeHead[edges]]][::-1]
+        firstEdge[edgeHead[edges]] = edges
+        isChanged[changed] = False
+
+        pred[changed] = Grev.neighbours[firstEdge[changed]]
+
+        if iRound == n - 1:
+            raise NegativeCycleError(findCycle(pred, changed[0]))
+
+    return dist, pred
+
+#-------------------------------------------------------------------------------
+def findCycle(pred, v):
+    """ Return the cycle of the predecessor graph reached by walking back from
+        v, which must lead to a cycle.
+    """
+
+    # n steps back from v must be on the cycle, as every path of the
+    # predecessor graph without one has at most n - 1 edges.
+    for i in range(len(pred)):
+        v = pred[v]
+
+    cycle = [int(v)]
+    while pred[cycle[-1]] != v:
+        cycle.append(int(pred[cycle[-1]]))
+
+    return cycle[::-1]
+
+#-------------------------------------------------------------------------------
+def reweight(G, h):
+    """ Return G with each edge (u, v) of length w(u, v) + h[u] - h[v].
+
+        Small negative lengths left by rounding are set to 0.
+    """
+
+    weights = G.weights + h[G.tails()] - h[G.neighbours]
+
+    return csrGraph.CSRGraph(G.offsets, G.neighbours,
+                             np.maximum(weights, 0.0))
+
+#-------------------------------------------------------------------------------
+def johnson(G, sources = None, targets = None, **options):
+    """ Find all pairs shortest path lengths with Johnson's algorithm.
+
+        Args:
+          G:       Weighted CSRGraph of graph G, or an adjacency list of
+                   dictionaries of adjacent nodes to edge lengths. Edge
+                   lengths may be negative.
+          sources: List or array of nodes to start from. Default is None; if
+                   default is supplied every node is a source.
+          targets: List or array of nodes to end at. Default is None; if
+                   default is supplied every node is a target.
+          options: Passed on to dijkstrasShortestPath.distanceMatrix, e.g.
+                   numWorkers, chunkSize, progress.
+
+        Returns:
+          matrix: float array of shape (len(sources), len(targets)) of the
+                  shortest path lengths, inf if unreachable.
+
+        Raises:
+          ValueError:         If G has no edge weights.
+          NegativeCycleError: If G has a negative cycle.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        G = csrGraph.fromAdjList(G)
+
+    if sources is None:
+        sources = np.arange(G.numNodes)
+    if targets is None:
+        targets = np.arange(G.numNodes)
+    sources = np.asarray(sources, dtype = np.int64)
+    targets = np.asarray(targets, dtype = np.int64)
+
+    h, pred = bellmanFord(G)
+
+    matrix = dijkstrasShortestPath.distanceMatrix(reweight(G, h), sources,
+                                                  targets, **options)
+
+    # Undo the reweighting; inf stays inf
+    return matrix - h[sources][:, None] + h[targets][None, :]
+
+#-------------------------------------------------------------------------------
+def main(args):
+    """ Run main code.
+
+        Read the graph in edges.txt and print the shortest of its shortest
+        paths, or that it has a negative cycle.
+
+        Args:
+          args: Command line arguments.
+
+        Results:
+          prints the shortest shortest path length
+
+        Raises:
+          None.
+    """
+
+    inputFile = 'edges.txt'
+
+    G = readInput(inputFile)
+    if G == 1:
+        return
+
+    # Node 0 is not in the file
+    nodes = np.arange(1, G.numNodes)
+
+    try:
+        matrix = johnson(G, nodes, nodes)
+    except NegativeCycleError as error:
+        print error
+        return
+
+    # A path from a node to itself is not a shortest path between two nodes
+    np.fill_diagonal(matrix, np.inf)
+    print 'Shortest shortest path:', matrix.min()
+
+#===============================================================================
+if __name__ == "__main__":
+    main(sys.argv)
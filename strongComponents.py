@@ -1,52 +1,63 @@
 """ Compute the strong components of a directed graph using Kosaraju's two-pass
-    algorithm.
+    algorithm, or Tarjan's single-pass algorithm.
 """
 #===============================================================================
 import sys
+import time
 import numpy as np
 import Queue
 import operator
+import multiprocessing
+import csrGraph
+from DFS import topologicalLevels  # This module has its own DFS function
 
 
 #===============================================================================
 def readInput(inputFile):
+    """ Read a directed graph from an edge list file.
+
+        Each line holds the tail and head node of an edge. The whole file is
+        parsed into integer arrays in one call, and both graphs are built by
+        sorting the edges (see csrGraph.fromEdges). Only the labels in the
+        file are nodes: they are renumbered 0, ..., n - 1 in order, so a gap
+        in the labels (e.g. 0 in a file labelled from 1) does not become an
+        isolated node, and so a strong component of its own.
+
+        Args:
+          inputFile: The input file name and location.
+
+        Returns:
+          G:          CSRGraph of the edges.
+          Grev:       CSRGraph of the edges reversed.
+          nodeLabels: int array of the label in the file of each node.
+
+        Raises:
+          IOError: If the file cannot be opened.
+    """
 
     try:
-        inF = open(inputFile, 'r')
-    except:
+        G = csrGraph.readEdgeList(inputFile)
+    except IOError:
         print 'Cannot open', inputFile
         return 1
-    
-    keyRange = range(1, 10)
-
-    G    = dict.fromkeys(keyRange)
-    Grev = dict.fromkeys(keyRange)
 
-    for line in inF:
-        linedata = line.split()
-        node1 = int(linedata[0])
-        node2 = int(linedata[1])
-
-        if G[node1] == None:
-            G[node1] = [node2]
-        else:
-            G[node1].append(node2)
-            
-        if Grev[node2] == None:
-            Grev[node2] = [node1]
-        else:
-            Grev[node2].append(node1)
-    
-    inF.close()
+    # Renumbering by rank keeps the edges sorted by tail
+    nodeLabels, nodes = np.unique(np.r_[G.tails(), G.neighbours],
+                                  return_inverse = True)
+    G    = csrGraph.fromEdges(nodes[:G.numEdges], nodes[G.numEdges:],
+                              len(nodeLabels))
+    Grev = G.transpose()
     
-    return G, Grev
+    return G, Grev, nodeLabels
 
 #-------------------------------------------------------------------------------
 def DFSLoop(G, nodeOrder):
     """ Run DFS to find the strongly connected components of the graph G.
 
         Args:
-          G: Adjacency list of graph G.
+          G:         Adjacency list of graph G, or a CSRGraph (e.g. from
+                     csrGraph.loadBinary).
+          nodeOrder: The node to search from for each finish time 1, ..., n.
 
         Returns:
           leader:     List of what the leading node is for each node.
@@ -56,6 +67,9 @@ def DFSLoop(G, nodeOrder):
           None.
     """
 
+    if isinstance(G, csrGraph.CSRGraph):
+        return DFSLoopArray(G, nodeOrder)
+
     t = 0
     s = None
     n = len(G.keys())
@@ -72,6 +86,68 @@ def DFSLoop(G, nodeOrder):
 
     return finishTime, leader
 
+#-------------------------------------------------------------------------------
+def DFSLoopArray(G, nodeOrder):
+    """ Run DFS to find the strongly connected components of the CSR graph G.
+
+        The same as DFSLoop, but the depth first search uses an explicit stack
+        rather than recursion, so deep graphs do not hit the recursion limit.
+
+        Args:
+          G:         CSRGraph of graph G.
+          nodeOrder: Array, nodeOrder[fTime] is the node to search from for
+                     each finish time 1, ..., G.numNodes.
+
+        Returns:
+          finishTime: int array of finish time for each node.
+          leader:     int array of what the leading node is for each node.
+
+        Raises:
+          None.
+    """
+
+    t = 0
+    n = G.numNodes
+    explored   = np.zeros(n, dtype = np.int8)
+    finishTime = np.zeros(n, dtype = csrGraph.indexDtype(n))
+    leader     = np.zeros(n, dtype = csrGraph.indexDtype(n))
+
+    offsets    = G.offsets
+    neighbours = G.neighbours
+
+    for fTime in range(n, 0, -1):
+        iNode = nodeOrder[fTime]  # Find the node with finishing time given
+        if explored[iNode]:
+            continue
+
+        s = fTime
+        explored[iNode] = 1
+        leader[iNode]   = s
+
+        # Stack of nodes and the index of the next edge to follow from each
+        stack     = [iNode]
+        nextEdges = [offsets[iNode]]
+
+        while stack:
+            jNode = stack[-1]
+            iEdge = nextEdges[-1]
+
+            if iEdge < offsets[jNode + 1]:
+                nextEdges[-1] = iEdge + 1
+                kNode = neighbours[iEdge]
+                if explored[kNode] == 0:
+                    explored[kNode] = 1
+                    leader[kNode]   = s
+                    stack.append(kNode)
+                    nextEdges.append(offsets[kNode])
+            else:
+                stack.pop()
+                nextEdges.pop()
+                t += 1
+                finishTime[jNode] = t
+
+    return finishTime, leader
+
 #-------------------------------------------------------------------------------
 def DFS(G, iNode, explored, finishTime, leader, s, t):
 
@@ -88,19 +164,501 @@ def DFS(G, iNode, explored, finishTime, leader, s, t):
 
     return explored, finishTime, leader, s, t
             
+#-------------------------------------------------------------------------------
+def kosarajuSCC(G, Grev):
+    """ Find the strong components of G with Kosaraju's two-pass algorithm.
+
+        Args:
+          G:    Adjacency list of graph G, with nodes labelled 1, ..., n, or a
+                CSRGraph (e.g. from readInput).
+          Grev: Adjacency list or CSRGraph of G with every edge reversed.
+
+        Returns:
+          leader:        Dictionary of the leader of each node's component,
+                         or an int array indexed by node for CSR graphs.
+          sortedSummary: List of (leader, component size) sorted by size, or
+                         an int array of rows for CSR graphs.
+
+        Raises:
+          None.
+    """
+
+    if isinstance(G, csrGraph.CSRGraph):
+        # Search from nodes n - 1, ..., 0 on the first pass
+        n         = G.numNodes
+        nodeOrder = np.arange(-1, n)
+
+        finishTime, leader = DFSLoop(Grev, nodeOrder)
+        nodeOrder[finishTime] = np.arange(n)
+        finishTime, leader = DFSLoop(G, nodeOrder)
+
+        sizes   = np.bincount(leader)
+        leaders = np.flatnonzero(sizes)
+        order   = np.argsort(sizes[leaders], kind = 'mergesort')
+        sortedSummary = np.column_stack([leaders[order],
+                                         sizes[leaders[order]]])
+
+        return leader, sortedSummary
+
+    nodeOrder = dict.fromkeys(G.keys(), 0)
+    for iNode in range(1, len(G.keys()) + 1):
+        nodeOrder[iNode] = iNode
+
+    # First Pass on reverse graph    
+    finishTime, leader = DFSLoop(Grev, nodeOrder)
+
+    # Set nodeOrder by entries in finishTime
+    for iNode, fTime in finishTime.iteritems():
+        nodeOrder[fTime] = iNode
+    
+    # Second pass on forward graph
+    finishTime, leader = DFSLoop(G, nodeOrder)
+
+    summary = {}
+    for key, value in leader.iteritems():
+        if value not in summary.keys():
+            summary[value] = 1
+        else:
+            summary[value] += 1
+    sortedSummary = sorted(summary.items(), key = operator.itemgetter(1))
+
+    return leader, sortedSummary
+
+#-------------------------------------------------------------------------------
+def tarjanSCC(G):
+    """ Find the strong components of G with Tarjan's single-pass algorithm.
+
+        One depth first search, with an explicit stack rather than recursion,
+        on the forward graph only. Each node gets a low-link, the earliest
+        discovery time it reaches through its DFS subtree and one edge to a
+        node still in an unfinished component. A node whose low-link is its
+        own discovery time is the root of a component, which is every node
+        above it on the component stack.
+
+        Components are labelled 0, 1, ... in the order they are completed,
+        which is a reverse topological order of the component graph: every
+        edge between components goes from a higher label to a lower one.
+
+        The search runs on the CSR arrays converted to lists once, as
+        indexing a numpy array one element at a time is much slower than
+        indexing a list. The labels become an array on return.
+
+        Args:
+          G: Adjacency list of graph G, or a CSRGraph.
+
+        Returns:
+          labels:        Component label of each node, an int array indexed by
+                         node, or a dictionary if G is an adjacency list.
+          sortedSummary: int array of (label, component size) rows, sorted by
+                         size.
+
+        Raises:
+          None.
+    """
+
+    if not isinstance(G, csrGraph.CSRGraph):
+        if not G:
+            return {}, np.zeros((0, 2), dtype = np.int64)
+
+        labels, sortedSummary = tarjanSCC(csrGraph.fromAdjList(G))
+
+        # Drop labels missing from G, which become isolated nodes (and so
+        # components) in the CSR graph.
+        keys  = np.array(sorted(G.keys()), dtype = np.int64)
+        sizes = np.bincount(labels[keys], minlength = labels.max() + 1)
+        kept  = sortedSummary[sizes[sortedSummary[:, 0]] > 0, 0]
+        sortedSummary = np.column_stack([kept, sizes[kept]])
+
+        return dict(zip(keys.tolist(), labels[keys].tolist())), sortedSummary
+
+    n          = G.numNodes
+    offsets    = G.offsets.tolist()
+    neighbours = G.neighbours.tolist()
+
+    disc   = [-1] * n  # Discovery times
+    low    = [0] * n   # Low-links
+    labels = [-1] * n
+
+    # Stack of the nodes in unfinished components, and the position of each
+    # node on it.
+    componentStack = []
+    stackPosition  = [0] * n
+
+    time          = 0
+    numComponents = 0
+
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+
+        disc[root] = low[root] = time
+        time      += 1
+        stackPosition[root] = len(componentStack)
+        componentStack.append(root)
+
+        # Depth first search stack of nodes and the position of the next
+        # edge to follow from each.
+        stack     = [root]
+        nextEdges = [offsets[root]]
+
+        while stack:
+            v = stack[-1]
+            i = nextEdges[-1]
+
+            if i < offsets[v + 1]:
+                nextEdges[-1] = i + 1
+                w = neighbours[i]
+
+                if disc[w] < 0:
+                    disc[w]    = low[w] = time
+                    time      += 1
+                    stack.append(w)
+                    nextEdges.append(offsets[w])
+                    stackPosition[w] = len(componentStack)
+                    componentStack.append(w)
+                elif labels[w] < 0 and disc[w] < low[v]:
+                    low[v] = disc[w]  # w is in an unfinished component
+            else:
+                stack.pop()
+                nextEdges.pop()
+
+                if low[v] == disc[v]:
+                    # v is the root of a component: pop it off the stack
+                    position = stackPosition[v]
+                    for u in componentStack[position:]:
+                        labels[u] = numComponents
+                    del componentStack[position:]
+                    numComponents += 1
+
+                if stack:
+                    u = stack[-1]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+
+    labels        = np.array(labels, dtype = csrGraph.indexDtype(n))
+    sizes         = np.bincount(labels, minlength = numComponents)
+    order         = np.argsort(sizes, kind = 'mergesort')
+    sortedSummary = np.column_stack([order, sizes[order]])
+
+    return labels, sortedSummary
+
+#-------------------------------------------------------------------------------
+def condensation(G, labels):
+    """ Build the condensation of G, the DAG of its strong components.
+
+        Each component becomes a node, with one edge for every pair of
+        components joined by at least one edge of G. The edges are mapped to
+        components, de-duplicated with np.unique and built into a CSR graph,
+        and the DAG is ordered by topologicalLevels, all as array operations.
+
+        Args:
+          G:      CSRGraph of graph G.
+          labels: Array of the component label of each node, e.g. from
+                  tarjanSCC or the leaders from kosarajuSCC.
+
+        Returns:
+          C:          CSRGraph of the condensation, with nodes 0, ..., k - 1.
+          order:      Array of the components in topological order.
+          components: Array of the component of each node of G, i.e. the
+                      labels renumbered 0, ..., k - 1.
+
+        Raises:
+          None.
+    """
+
+    uniqueLabels, components = np.unique(labels, return_inverse = True)
+    k = len(uniqueLabels)
+
+    tails = components[G.tails()]
+    heads = components[G.neighbours]
+
+    # Edges between different components, one per pair
+    between = tails != heads
+    edges   = np.unique(tails[between].astype(np.int64) * k + heads[between])
+
+    C = csrGraph.fromEdges(edges // k, edges % k, k)
+
+    levels, criticalPathLength = topologicalLevels(C)
+    order = np.concatenate(levels) if levels else np.zeros(0, dtype = int)
+
+    return C, order, components
+
+#-------------------------------------------------------------------------------
+# Graphs and per-node arrays shared with the parallelSCC worker processes
+workerState = {}
+
+def initParallelSCCWorker(state):
+    """ Store the shared graphs and arrays in a parallelSCC worker. """
+
+    workerState.update(state)
+
+#-------------------------------------------------------------------------------
+def inSubproblem(nodes, subproblem):
+    """ Return a mask of the nodes still unlabelled in subproblem. """
+
+    return ((workerState['subproblem'][nodes] == subproblem) &
+            (workerState['labels'][nodes] < 0))
+
+#-------------------------------------------------------------------------------
+def countSubproblemEdges(G, nodes, subproblem):
+    """ Return the number of edges from each node to its subproblem. """
+
+    lengths = G.offsets[nodes + 1] - G.offsets[nodes]
+    heads   = csrGraph.gatherNeighbours(G, nodes)
+    iNode   = np.repeat(np.arange(len(nodes)), lengths)
+
+    return np.bincount(iNode[inSubproblem(heads, subproblem)],
+                       minlength = len(nodes))
+
+#-------------------------------------------------------------------------------
+def trimSubproblem(nodes, subproblem):
+    """ Label the nodes of a subproblem with no in or out edges within it.
+
+        Such a node is a strong component on its own. Removing it can leave
+        its neighbours with no in or out edges, so the degrees of the
+        neighbours are decremented and they are checked in turn; each edge is
+        looked at a fixed number of times.
+
+        Returns:
+          nodes: The nodes left.
+          inDeg: Their in-degrees within the subproblem.
+          outDeg: Their out-degrees within the subproblem.
+    """
+
+    G, Grev = workerState['G'], workerState['Grev']
+    labels  = workerState['labels']
+    inDeg   = workerState['inDeg']
+    outDeg  = workerState['outDeg']
+
+    outDeg[nodes] = countSubproblemEdges(G, nodes, subproblem)
+    inDeg[nodes]  = countSubproblemEdges(Grev, nodes, subproblem)
+    removed = nodes[(outDeg[nodes] == 0) | (inDeg[nodes] == 0)]
+
+    while len(removed) > 0:
+        labels[removed] = removed
+
+        # Edges out of the removed nodes lower the in-degree of their heads,
+        # and edges into them the out-degree of their tails.
+        heads = csrGraph.gatherNeighbours(G, removed)
+        heads, inCounts = np.unique(heads[inSubproblem(heads, subproblem)],
+                                    return_counts = True)
+        tails = csrGraph.gatherNeighbours(Grev, removed)
+        tails, outCounts = np.unique(tails[inSubproblem(tails, subproblem)],
+                                     return_counts = True)
+        inDeg[heads]  -= inCounts
+        outDeg[tails] -= outCounts
+
+        changed = np.union1d(heads, tails)
+        removed = changed[(outDeg[changed] == 0) | (inDeg[changed] == 0)]
+
+    nodes = nodes[labels[nodes] < 0]
+
+    return nodes, inDeg[nodes], outDeg[nodes]
+
+#-------------------------------------------------------------------------------
+def reachable(G, s, subproblem, mark):
+    """ Mark the nodes of a subproblem reachable from s with the stamp s. """
+
+    mark[s]  = s
+    frontier = np.array([s])
+
+    while len(frontier) > 0:
+        W = csrGraph.gatherNeighbours(G, frontier)
+        W = np.unique(W[inSubproblem(W, subproblem) & (mark[W] != s)])
+        mark[W]  = s
+        frontier = W
+
+#-------------------------------------------------------------------------------
+def solveSubproblem(task):
+    """ Find strong components of one subproblem with trimming and
+        forward-backward reachability.
+
+        Run in a parallelSCC worker process. The subproblem is trimmed, then
+        the nodes both reachable from and reaching a pivot form its strong
+        component. The rest splits into three subproblems, the nodes only
+        reachable from the pivot, only reaching it and neither, as no strong
+        component spans two of them. Subproblems smaller than the serial
+        threshold are solved here, larger ones are returned to be shared out.
+        Each subproblem is numbered by its smallest node, and every node
+        labelled by a node of its component.
+
+        Args:
+          task: Tuple of the subproblem number, its nodes and the serial
+                threshold.
+
+        Returns:
+          tasks: List of subproblems left to solve, in the same form.
+    """
+
+    subproblem, nodes, serialThreshold = task
+
+    G, Grev      = workerState['G'], workerState['Grev']
+    labels       = workerState['labels']
+    subproblems  = workerState['subproblem']
+    markF, markB = workerState['markF'], workerState['markB']
+
+    stack = [(subproblem, nodes)]
+    tasks = []
+
+    while stack:
+        subproblem, nodes = stack.pop()
+
+        nodes, inDeg, outDeg = trimSubproblem(nodes, subproblem)
+        if len(nodes) == 0:
+            continue
+
+        # The pivot most likely to be in a large component
+        pivot = nodes[np.argmax(inDeg.astype(float) * outDeg)]
+        reachable(G, pivot, subproblem, markF)
+        reachable(Grev, pivot, subproblem, markB)
+
+        isForward  = markF[nodes] == pivot
+        isBackward = markB[nodes] == pivot
+        labels[nodes[isForward & isBackward]] = pivot
+
+        for part in [isForward & ~isBackward, ~isForward & isBackward,
+                     ~isForward & ~isBackward]:
+            partNodes = nodes[part]
+            if len(partNodes) == 0:
+                continue
+
+            partNumber = partNodes.min()
+            subproblems[partNodes] = partNumber
+            if len(partNodes) < serialThreshold:
+                stack.append((partNumber, partNodes))
+            else:
+                tasks.append((partNumber, partNodes, serialThreshold))
+
+    return tasks
+
+#-------------------------------------------------------------------------------
+def parallelSCC(G, Grev = None, numWorkers = None, serialThreshold = 10000):
+    """ Find the strong components of G with a pool of processes.
+
+        The graphs and the per-node arrays are copied to shared memory. The
+        nodes start as one subproblem, and each round the subproblems are
+        shared out among the workers (see solveSubproblem), which return the
+        large subproblems they split off for the next round. Trimming labels
+        the many single-node components without any search, so the
+        forward-backward searches are left with the large components.
+
+        Args:
+          G:               CSRGraph of graph G.
+          Grev:            CSRGraph of G with every edge reversed. Default is
+                           None; if default is supplied it is built.
+          numWorkers:      Number of worker processes. Default is None; if
+                           default is supplied the number of CPUs is used.
+          serialThreshold: Subproblems with fewer nodes are solved by the
+                           worker which split them off. Default is 10000.
+
+        Returns:
+          labels:        int array of a representative node of each node's
+                         component.
+          sortedSummary: int array of (representative, component size) rows,
+                         sorted by size.
+
+        Raises:
+          None.
+    """
+
+    if Grev is None:
+        Grev = G.transpose()
+    if numWorkers is None:
+        numWorkers = multiprocessing.cpu_count()
+
+    n     = G.numNodes
+    state = {'G':    csrGraph.toSharedMemory(G),
+             'Grev': csrGraph.toSharedMemory(Grev)}
+    for name in ['labels', 'subproblem', 'inDeg', 'outDeg', 'markF', 'markB']:
+        state[name] = csrGraph.sharedArray(n, np.int64)
+    state['labels'][:] = -1
+    state['markF'][:]  = -1
+    state['markB'][:]  = -1
+
+    pool = multiprocessing.Pool(numWorkers, initParallelSCCWorker, (state,))
+    try:
+        tasks = [(0, np.arange(n), serialThreshold)] if n > 0 else []
+        while tasks:
+            results = pool.map(solveSubproblem, tasks, chunksize = 1)
+            tasks   = [task for result in results for task in result]
+    finally:
+        pool.close()
+        pool.join()
+
+    labels  = np.array(state['labels'])
+    sizes   = np.bincount(labels, minlength = n)
+    leaders = np.flatnonzero(sizes)
+    order   = np.argsort(sizes[leaders], kind = 'mergesort')
+    sortedSummary = np.column_stack([leaders[order], sizes[leaders[order]]])
+
+    return labels, sortedSummary
+
+#-------------------------------------------------------------------------------
+def benchmarkSCC(G, Grev = None, maxWorkers = None):
+    """ Print the time taken by kosarajuSCC, tarjanSCC and parallelSCC with
+        1, 2, 4, ... workers.
+
+        Args:
+          G:          CSRGraph of graph G.
+          Grev:       CSRGraph of G with every edge reversed. Default is None;
+                      if default is supplied it is built.
+          maxWorkers: Largest number of workers. Default is None; if default
+                      is supplied the number of CPUs is used.
+
+        Returns:
+          times: Dictionary of method (or number of workers) to time taken in
+                 seconds.
+
+        Raises:
+          None.
+    """
+
+    if Grev is None:
+        Grev = G.transpose()
+    if maxWorkers is None:
+        maxWorkers = multiprocessing.cpu_count()
+
+    times = {}
+
+    startTime = time.time()
+    kosarajuSCC(G, Grev)
+    times['kosaraju'] = time.time() - startTime
+    print 'Kosaraju:', times['kosaraju'], 's'
+
+    startTime = time.time()
+    tarjanSCC(G)
+    times['tarjan'] = time.time() - startTime
+    print 'Tarjan:', times['tarjan'], 's'
+
+    # 1, 2, 4, ... workers, then maxWorkers
+    workerCounts = [2 ** i for i in range(int(np.log2(maxWorkers)) + 1)]
+    if workerCounts[-1] != maxWorkers:
+        workerCounts.append(maxWorkers)
+
+    for numWorkers in workerCounts:
+        startTime = time.time()
+        parallelSCC(G, Grev, numWorkers)
+        times[numWorkers] = time.time() - startTime
+
+        speedUp = times['kosaraju'] / times[numWorkers]
+        print numWorkers, 'workers:', times[numWorkers], 's,', speedUp, \
+              'times Kosaraju'
+
+    return times
+
 #-------------------------------------------------------------------------------
 def main(args):
     """ Run main code.
 
-        Read input file in the form of an adjancency list.
-        Call BFS
-        print exploredList
+        Read input file in the form of an edge list.
+        Call tarjanSCC
+        print the component of each node and the component sizes
 
         Args:
           args: Command line arguments.
 
         Results:
-          prints exploredList
+          prints leader and sortedSummary
 
         Raises:
           sys.exit: if there are not 2 arguments in call from command line.
@@ -109,7 +667,7 @@ def main(args):
     inputFile = 'sCTest.txt'
     
     # Read Input File
-    G, Grev = readInput(inputFile)
+    G, Grev, nodeLabels = readInput(inputFile)
     
 ##    # Adjacency List of graph G
 ##    G    = {}
@@ -122,40 +680,11 @@ def main(args):
 ##    G[7] = [1]
 ##    G[8] = [5, 6]
 ##    G[9] = [3, 7]
-##
-##    Grev    = {}
-##    Grev[1] = [7]
-##    Grev[2] = [5]
-##    Grev[3] = [9]
-##    Grev[4] = [1]
-##    Grev[5] = [8]
-##    Grev[6] = [3, 8]
-##    Grev[7] = [4, 9]
-##    Grev[8] = [2]
-##    Grev[9] = [6]
-    
-    nodeOrder = dict.fromkeys(G.keys(), 0)
-    for iNode in range(1, len(G.keys()) + 1):
-        nodeOrder[iNode] = iNode
-
-    # First Pass on reverse graph    
-    finishTime, leader = DFSLoop(Grev, nodeOrder)
 
-    # Set nodeOrder by entries in finishTime
-    for iNode, fTime in finishTime.iteritems():
-        nodeOrder[fTime] = iNode
-    
-    # Second pass on forward graph
-    finishTime, leader = DFSLoop(G, nodeOrder)
+    # Single pass on the forward graph
+    leader, sortedSummary = tarjanSCC(G)
 
-    print leader
-    summary = {}
-    for key, value in leader.iteritems():
-        if value not in summary.keys():
-            summary[value] = 1
-        else:
-            summary[value] += 1
-    sortedSummary = sorted(summary.items(), key = operator.itemgetter(1))
+    print dict(zip(nodeLabels.tolist(), leader.tolist()))
     print sortedSummary
 
 #===============================================================================
@@ -2,8 +2,11 @@
 
 #===============================================================================
 import unittest
+import os
+import tempfile
 import numpy as np
 import BFS
+import csrGraph
 
 
 #===============================================================================
@@ -80,6 +83,289 @@ class TestBFSShortestPath(unittest.TestCase):
         self.assertEqual(expDist, dist)
         
 
+#-------------------------------------------------------------------------------
+class TestBFSCSRGraph(unittest.TestCase):
+    """ Unit test BFS on a CSR graph. """
+
+    def test_do_not_find_unconnected_element(self):
+        """ Does an unconnected node remain unexplored? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 3, 4]
+        G[3] = [1, 2, 4, 5]
+        G[4] = [2, 3, 5]
+        G[5] = [4, 5]
+        G[6] = [7]
+        G[7] = [6]
+
+        # Start node
+        s = 0
+
+        explored    = BFS.BFS(csrGraph.fromAdjList(G), s)
+        expExplored = [1, 1, 1, 1, 1, 1, 0, 0]  # i.e. 6 & 7 unexplored
+
+        self.assertEqual(expExplored, explored.tolist())
+
+
+    def test_correctly_identify_shortest_path(self):
+        """ Is the shortest path correctly identified? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 3, 4]
+        G[3] = [1, 2, 4, 5]
+        G[4] = [2, 3, 5]
+        G[5] = [4, 5]
+        G[6] = []
+
+        # Start node
+        s = 0
+
+        dist    = BFS.BFSShortestPath(csrGraph.fromAdjList(G), s)
+        expDist = [0, 1, 1, 2, 2, 3, -1]  # i.e. 6 unreachable
+
+        self.assertEqual(expDist, dist.tolist())
+
+
+    def test_binary_file_graph(self):
+        """ Is a graph loaded from a binary file searched correctly? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 3, 4]
+        G[3] = [1, 2, 4, 5]
+        G[4] = [2, 3, 5]
+        G[5] = [4, 5]
+        G[6] = []
+
+        # Start node
+        s = 0
+
+        fileHandle, binaryFile = tempfile.mkstemp(suffix = '.csr')
+        os.close(fileHandle)
+        try:
+            csrGraph.writeBinary(csrGraph.fromAdjList(G), binaryFile)
+            dist = BFS.BFSShortestPath(csrGraph.loadBinary(binaryFile), s)
+        finally:
+            os.remove(binaryFile)
+
+        expDist = [0, 1, 1, 2, 2, 3, -1]  # i.e. 6 unreachable
+
+        self.assertEqual(expDist, dist.tolist())
+
+
+#-------------------------------------------------------------------------------
+class TestBFSLevelSynchronous(unittest.TestCase):
+    """ Unit test level synchronous BFS. """
+
+    def test_correctly_identify_shortest_path(self):
+        """ Is the shortest path correctly identified? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 3, 4]
+        G[3] = [1, 2, 4, 5]
+        G[4] = [2, 3, 5]
+        G[5] = [4, 5]
+        G[6] = [7]
+        G[7] = [6]
+
+        # Start node
+        s = 0
+
+        dist    = BFS.BFSShortestPath(G, s, mode = 'level')
+        expDist = {0:0, 1:1, 2:1, 3:2, 4:2, 5:3, 6:np.inf, 7:np.inf}
+
+        self.assertEqual(expDist, dist)
+
+
+    def test_same_distances_as_queue(self):
+        """ Are the distances the same as the queue based BFS? """
+
+        np.random.seed(20160830)
+        G = csrGraph.fromEdges(np.random.randint(0, 500, 2000),
+                               np.random.randint(0, 500, 2000), 500)
+
+        # Start node
+        s = 0
+
+        dist    = BFS.BFSShortestPath(G, s, mode = 'level')
+        expDist = BFS.BFSShortestPath(G, s)
+
+        self.assertEqual(expDist.tolist(), dist.tolist())
+
+
+#-------------------------------------------------------------------------------
+class TestBFSDirectionOptimizing(unittest.TestCase):
+    """ Unit test direction-optimizing BFS. """
+
+    def test_same_distances_as_queue(self):
+        """ Are the distances the same as the queue based BFS? """
+
+        np.random.seed(20160830)
+        tails = np.random.randint(0, 500, 2000)
+        heads = np.random.randint(0, 500, 2000)
+        G     = csrGraph.fromEdges(np.r_[tails, heads], np.r_[heads, tails],
+                                   500)
+
+        # Start node
+        s = 0
+
+        counters = {}
+        dist     = BFS.BFSShortestPath(G, s, mode = 'direction',
+                                       counters = counters)
+        expDist  = BFS.BFSShortestPath(G, s)
+
+        self.assertEqual(expDist.tolist(), dist.tolist())
+        self.assertTrue(counters['bottomUpLevels'] > 0)
+        self.assertTrue(counters['topDownEdges'] + counters['bottomUpEdges'] <
+                        2 * G.numEdges)
+
+    def test_search_ending_bottom_up(self):
+        """ Does a search whose last level is bottom-up finish? """
+
+        # Path graph 0 - 1 - 2 - 3, switching to bottom-up straight away
+        G = csrGraph.fromEdges([0, 1, 1, 2, 2, 3], [1, 0, 2, 1, 3, 2])
+
+        counters = {}
+        dist     = BFS.BFSDirectionOptimizing(G, 0, alpha = 1, beta = 1000,
+                                              counters = counters)
+
+        self.assertEqual([0, 1, 2, 3], dist.tolist())
+        self.assertTrue(counters['bottomUpLevels'] > 0)
+
+
+#-------------------------------------------------------------------------------
+class TestBFSPath(unittest.TestCase):
+    """ Unit test bidirectional BFS. """
+
+    def test_correctly_identify_shortest_path(self):
+        """ Is the shortest path correctly identified? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 4]
+        G[3] = [1, 5]
+        G[4] = [2, 3]
+        G[5] = [3]
+
+        dist, path = BFS.BFSPath(G, 0, 5)
+
+        self.assertEqual(3, dist)
+        self.assertEqual([0, 1, 3, 5], path)
+
+
+    def test_do_not_find_unconnected_element(self):
+        """ Is no path found to an unconnected node? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1]
+        G[1] = [0]
+        G[2] = [3]
+        G[3] = [2]
+
+        dist, path = BFS.BFSPath(G, 0, 3)
+
+        self.assertEqual(-1, dist)
+        self.assertEqual([], path)
+
+
+#-------------------------------------------------------------------------------
+class TestMultiSourceBFS(unittest.TestCase):
+    """ Unit test multi-source BFS. """
+
+    def test_same_distances_as_single_source(self):
+        """ Is each row the same as a BFS from that start node? """
+
+        np.random.seed(20160830)
+        G = csrGraph.fromEdges(np.random.randint(0, 300, 1000),
+                               np.random.randint(0, 300, 1000), 300)
+
+        # Start nodes, more than fit in one 64 bit word
+        sources = np.random.randint(0, 300, 100)
+
+        dist = BFS.multiSourceBFS(G, sources)
+
+        self.assertEqual((100, 300), dist.shape)
+        for i, s in enumerate(sources):
+            expDist = BFS.BFSShortestPath(G, s)
+            self.assertEqual(expDist.tolist(), dist[i].tolist())
+
+
+#-------------------------------------------------------------------------------
+class TestParallelBFS(unittest.TestCase):
+    """ Unit test parallel BFS. """
+
+    def test_same_distances_as_queue(self):
+        """ Are the distances the same as the queue based BFS? """
+
+        np.random.seed(20160830)
+        G = csrGraph.fromEdges(np.random.randint(0, 500, 2000),
+                               np.random.randint(0, 500, 2000), 500)
+
+        # Start node
+        s = 0
+
+        dist    = BFS.BFSShortestPath(G, s, mode = 'parallel', numWorkers = 3)
+        expDist = BFS.BFSShortestPath(G, s)
+
+        self.assertEqual(expDist.tolist(), dist.tolist())
+
+
+#-------------------------------------------------------------------------------
+class TestDynamicBFS(unittest.TestCase):
+    """ Unit test incremental BFS distances. """
+
+    def setUp(self):
+        """ A path 0 -> 1 -> 2 -> 3 -> 4 with a short cut 1 -> 3. """
+
+        G    = {}
+        G[0] = [1]
+        G[1] = [2, 3]
+        G[2] = [3]
+        G[3] = [4]
+        G[4] = []
+
+        self.dynamicBFS = BFS.DynamicBFS(G, 0)
+
+
+    def test_insert_edge(self):
+        """ Does an inserted edge shorten the distances after it? """
+
+        self.dynamicBFS.insertEdge(0, 3)
+
+        self.assertEqual([0, 1, 2, 1, 2], self.dynamicBFS.distances().tolist())
+
+
+    def test_delete_edge(self):
+        """ Does a deleted edge lengthen the distances after it? """
+
+        self.dynamicBFS.deleteEdge(1, 3)
+        self.assertEqual([0, 1, 2, 3, 4], self.dynamicBFS.distances().tolist())
+
+        self.dynamicBFS.applyUpdates(deletions = [(2, 3)])
+        self.assertEqual([0, 1, 2, -1, -1],
+                         self.dynamicBFS.distances().tolist())
+
+
+    def test_error_if_edge_not_in_graph(self):
+        """ Is an error raised if a deleted edge is not in the graph? """
+
+        self.assertRaises(ValueError, self.dynamicBFS.deleteEdge, 3, 1)
+
+
 #===============================================================================        
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,7 @@
 import unittest
 import numpy as np
 import DFS
+import csrGraph
 
 
 #===============================================================================
@@ -53,8 +54,70 @@ class TestDFS(unittest.TestCase):
                                                                     # unexplored
 
         self.assertEqual(expExploredList, exploredList)
+
+
+    def test_do_not_find_unconnected_element_csr(self):
+        """ Does an unconnected node of a CSR graph remain unexplored? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 3]
+        G[2] = [0, 3, 4]
+        G[3] = [1, 2, 4, 5]
+        G[4] = [2, 3, 5]
+        G[5] = [4, 5]
+        G[6] = [7]
+        G[7] = [6]
+
+        # Start node
+        s = 0
+
+        explored    = DFS.DFS(csrGraph.fromAdjList(G), s)
+        expExplored = [1, 1, 1, 1, 1, 1, 0, 0]  # i.e. 6 & 7 unexplored
+
+        self.assertEqual(expExplored, explored.tolist())
         
         
+#-------------------------------------------------------------------------------
+class TestDFSEvents(unittest.TestCase):
+    """ Unit test DFSEvents. """
+
+    def test_classify_edges(self):
+        """ Are the events in order and the edges correctly classified? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [2]
+        G[2] = [0]
+        G[3] = [2]
+
+        events    = list(DFS.DFSEvents(G))
+        eventsExp = [('discover', 0), ('tree', (0, 1)), ('discover', 1),
+                     ('tree', (1, 2)), ('discover', 2), ('back', (2, 0)),
+                     ('finish', 2), ('finish', 1), ('forward', (0, 2)),
+                     ('finish', 0), ('discover', 3), ('cross', (3, 2)),
+                     ('finish', 3)]
+
+        self.assertEqual(eventsExp, events)
+        self.assertEqual(eventsExp[:10],
+                         list(DFS.DFSEvents(csrGraph.fromAdjList(G), 0)))
+
+
+    def test_stop_early(self):
+        """ Can the caller stop the search part way through? """
+
+        G    = {}
+        G[0] = [1]
+        G[1] = [0]
+
+        events = DFS.DFSEvents(G, 0)
+
+        self.assertEqual(('discover', 0), next(events))
+        self.assertEqual(('tree', (0, 1)), next(events))
+
+
 #-------------------------------------------------------------------------------
 class TestDFSRecursive(unittest.TestCase):
     """ Unit test DFSRecursive. """
@@ -162,6 +225,190 @@ class TestDFSRecursive2(unittest.TestCase):
         self.assertEqual(expExploredList, exploredList)
         self.assertEqual(nodeOrderExp, nodeOrder)
 
+
+#-------------------------------------------------------------------------------
+class TestTopologicalOrder(unittest.TestCase):
+    """ Unit test topologicalOrder. """
+
+    def test_order_directed_acyclic_graph(self):
+        """ Are the nodes of a DAG correctly ordered? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [3]
+        G[2] = [4]
+        G[3] = [4, 5]
+        G[4] = [5]
+        G[5] = []
+        G[6] = [7]
+        G[7] = []
+
+        nodeOrder    = DFS.topologicalOrder(G)
+        nodeOrderExp = {0:3, 1:5, 2:4, 3:6, 4:7, 5:8, 6:1, 7:2}
+        self.assertEqual(nodeOrderExp, nodeOrder)
+
+        nodeOrder = DFS.topologicalOrder(csrGraph.fromAdjList(G))
+        self.assertEqual([3, 5, 4, 6, 7, 8, 1, 2], nodeOrder.tolist())
+
+
+    def test_order_long_path(self):
+        """ Is a path longer than the recursion limit ordered? """
+
+        n = 10000
+        G = csrGraph.fromEdges(np.arange(n - 1), np.arange(1, n), n)
+
+        nodeOrder = DFS.topologicalOrder(G)
+        self.assertEqual(range(1, n + 1), nodeOrder.tolist())
+
+
+    def test_error_raised_for_cycle(self):
+        """ Is an error raised, giving the back edge, if there is a cycle? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1]
+        G[1] = [2]
+        G[2] = [3, 0]
+        G[3] = []
+
+        with self.assertRaises(DFS.CycleError) as context:
+            DFS.topologicalOrder(G)
+        self.assertEqual((2, 0), context.exception.edge)
+
+        G = csrGraph.fromAdjList(G)
+        self.assertRaises(DFS.CycleError, DFS.topologicalOrder, G)
+
+
+#-------------------------------------------------------------------------------
+class TestTopologicalLevels(unittest.TestCase):
+    """ Unit test topologicalLevels. """
+
+    def test_levels_of_directed_acyclic_graph(self):
+        """ Are the nodes of a DAG grouped into the right levels? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [3]
+        G[2] = [4]
+        G[3] = [4, 5]
+        G[4] = [5]
+        G[5] = []
+        G[7] = [8]
+        G[8] = []
+
+        levels, criticalPathLength = DFS.topologicalLevels(G)
+        levelsExp = [[0, 7], [1, 2, 8], [3], [4], [5]]
+
+        self.assertEqual(levelsExp, [level.tolist() for level in levels])
+        self.assertEqual(5, criticalPathLength)
+
+
+    def test_critical_path_with_durations(self):
+        """ Is the critical path the longest total duration of a path? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [3]
+        G[2] = [3]
+        G[3] = []
+
+        durations = [1.0, 5.0, 2.0, 1.0]
+
+        levels, criticalPathLength = DFS.topologicalLevels(G, durations)
+
+        self.assertEqual(7.0, criticalPathLength)
+
+
+    def test_error_raised_for_cycle(self):
+        """ Is an error raised if there is a cycle? """
+
+        # Adjacency List of graph G
+        G    = {}
+        G[0] = [1]
+        G[1] = [2]
+        G[2] = [0]
+        G[3] = [0]
+
+        self.assertRaises(DFS.CycleError, DFS.topologicalLevels, G)
+
+
+#-------------------------------------------------------------------------------
+class TestArticulationPointsAndBridges(unittest.TestCase):
+    """ Unit test articulationPointsAndBridges. """
+
+    def test_find_points_and_bridges(self):
+        """ Are the articulation points and bridges correctly identified? """
+
+        # Two triangles 0-1-2 and 3-4-5 joined by the edge 2-3, with 6
+        # hanging off 5.
+        G    = {}
+        G[0] = [1, 2]
+        G[1] = [0, 2]
+        G[2] = [0, 1, 3]
+        G[3] = [2, 4, 5]
+        G[4] = [3, 5]
+        G[5] = [3, 4, 6]
+        G[6] = [5]
+
+        points, bridges = DFS.articulationPointsAndBridges(G)
+
+        self.assertEqual([2, 3, 5], points.tolist())
+        self.assertEqual([[2, 3], [5, 6]], sorted(bridges.tolist()))
+
+
+    def test_parallel_edge_is_not_a_bridge(self):
+        """ Is an edge with a parallel copy not a bridge? """
+
+        G    = {}
+        G[0] = [1, 1]
+        G[1] = [0, 0, 2]
+        G[2] = [1]
+
+        self.assertEqual([1], DFS.articulationPoints(G).tolist())
+        self.assertEqual([[1, 2]], DFS.bridges(G).tolist())
+
+
+#-------------------------------------------------------------------------------
+class TestDynamicTopologicalOrder(unittest.TestCase):
+    """ Unit test DynamicTopologicalOrder. """
+
+    def setUp(self):
+        """ A path 0 -> 1 -> 2 -> 3 and an isolated node 4. """
+
+        G    = {}
+        G[0] = [1]
+        G[1] = [2]
+        G[2] = [3]
+        G[3] = []
+        G[4] = []
+
+        self.dynamicOrder = DFS.DynamicTopologicalOrder(G)
+
+
+    def test_reorder_after_insertion(self):
+        """ Is the order still topological after an edge is inserted? """
+
+        # Node 4 is first in the order, so must be moved after node 3
+        edges = [(0, 1), (1, 2), (2, 3), (3, 4)]
+        self.dynamicOrder.insertEdges(edges[3:])
+
+        nodeOrder = self.dynamicOrder.nodeOrder
+        for u, v in edges:
+            self.assertTrue(nodeOrder[u] < nodeOrder[v])
+        self.assertEqual([1, 2, 3, 4, 5], sorted(nodeOrder.values()))
+
+
+    def test_error_raised_for_cycle(self):
+        """ Is an edge making a cycle rejected, leaving the order alone? """
+
+        nodeOrder = dict(self.dynamicOrder.nodeOrder)
+
+        self.assertRaises(DFS.CycleError, self.dynamicOrder.insertEdge, 3, 0)
+        self.assertEqual(nodeOrder, self.dynamicOrder.nodeOrder)
+
         
 #===============================================================================        
 if __name__ == '__main__':
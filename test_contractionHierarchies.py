@@ -0,0 +1,58 @@
+""" Unit test functions in contractionHierarchies module. """
+
+#===============================================================================
+import os
+import shutil
+import tempfile
+import unittest
+import contractionHierarchies
+import dijkstrasShortestPath
+
+
+#===============================================================================
+class TestContractionHierarchy(unittest.TestCase):
+    """ Unit test ContractionHierarchy on a small grid graph. """
+
+    def setUp(self):
+        """ A 6 x 6 grid graph and its hierarchy. """
+
+        self.G, coords = dijkstrasShortestPath.gridGraph(6, 6, seed = 0)
+        self.CH        = contractionHierarchies.build(self.G)
+
+
+    def test_query_agrees_with_dijkstra(self):
+        """ Is every query from node 0 the Dijkstra length and path? """
+
+        dist, pred = dijkstrasShortestPath.dijkstra(self.G, 0)
+
+        for t in range(self.G.numNodes):
+            length, path = self.CH.query(0, t)
+
+            self.assertAlmostEqual(dist[t], length)
+            self.assertEqual(0, path[0])
+            self.assertEqual(t, path[-1])
+
+
+    def test_save_and_load(self):
+        """ Is a hierarchy loaded back from the exact file name it was saved
+            under?
+        """
+
+        directory  = tempfile.mkdtemp()
+        outputFile = os.path.join(directory, 'hierarchy')
+
+        try:
+            self.CH.save(outputFile)
+            self.assertEqual(['hierarchy'], os.listdir(directory))
+
+            CH = contractionHierarchies.load(outputFile)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(self.CH.rank.tolist(), CH.rank.tolist())
+        self.assertEqual(self.CH.query(0, 35), CH.query(0, 35))
+
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
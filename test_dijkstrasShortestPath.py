@@ -0,0 +1,139 @@
+""" Unit test functions in dijkstrasShortestPath module. """
+
+#===============================================================================
+import unittest
+import numpy as np
+import dijkstrasShortestPath
+
+
+#===============================================================================
+class TestDijkstra(unittest.TestCase):
+    """ Unit test Dijkstra's algorithm on the graph of main. """
+
+    def setUp(self):
+        """ The graph of dijkstrasShortestPath.main. """
+
+        # Adjacency List of graph G
+        self.G    = {}
+        self.G[0] = {1:8, 3:15}
+        self.G[1] = {2:14, 3:3}
+        self.G[2] = {4:12}
+        self.G[3] = {2:7, 4:17}
+        self.G[4] = {4:0}
+
+        self.expDist = [0, 8, 18, 11, 28]
+
+
+    def test_shortest_path(self):
+        """ Does the IndexedHeap version find every shortest path length? """
+
+        variables = dijkstrasShortestPath.shortestPath(self.G, 0)
+
+        self.assertEqual(dict(enumerate(self.expDist)), variables.key)
+        self.assertEqual([0, 1, 3, 2, 4], variables.exploredNodes)
+
+
+    def test_dijkstra(self):
+        """ Does dijkstra find the same lengths with every queue? """
+
+        for queue in ['binary', 'dial', 'radix']:
+            dist, pred = dijkstrasShortestPath.dijkstra(self.G, 0,
+                                                        queue = queue)
+
+            self.assertEqual(self.expDist, dist.tolist())
+            self.assertEqual([-1, 0, 3, 1, 3], pred.tolist())
+
+
+    def test_early_exit(self):
+        """ Does a search stop once its target is settled? """
+
+        counters   = {}
+        dist, pred = dijkstrasShortestPath.dijkstra(self.G, 0, target = 3,
+                                                    counters = counters)
+
+        self.assertEqual(3, counters['settled'])
+        self.assertEqual(11, dist[3])
+        self.assertEqual(np.inf, dist[4])
+
+
+    def test_reconstruct_path(self):
+        """ Is the path rebuilt from the predecessors, empty if unreached? """
+
+        dist, pred = dijkstrasShortestPath.dijkstra(self.G, 0)
+
+        self.assertEqual([0, 1, 3, 2],
+                         dijkstrasShortestPath.reconstructPath(pred, 0, 2))
+        self.assertEqual([0], dijkstrasShortestPath.reconstructPath(pred, 0, 0))
+
+        dist, pred = dijkstrasShortestPath.dijkstra(self.G, 4)
+        self.assertEqual([], dijkstrasShortestPath.reconstructPath(pred, 4, 0))
+
+
+    def test_bad_queue_raised(self):
+        """ Are unknown queues and fractional weights for buckets rejected? """
+
+        self.assertRaises(ValueError, dijkstrasShortestPath.dijkstra, self.G,
+                          0, queue = 'fibonacci')
+
+        self.G[0][1] = 7.5
+        self.assertRaises(ValueError, dijkstrasShortestPath.dijkstra, self.G,
+                          0, queue = 'dial')
+
+
+#-------------------------------------------------------------------------------
+class TestPointToPoint(unittest.TestCase):
+    """ Unit test the point to point searches on a grid graph. """
+
+    def setUp(self):
+        """ A 10 x 10 grid graph. """
+
+        self.G, self.coords = dijkstrasShortestPath.gridGraph(10, 10,
+                                                              seed = 0)
+
+
+    def pathLength(self, path):
+        """ Return the length of a path of the grid graph. """
+
+        length = 0.0
+        for u, v in zip(path, path[1:]):
+            edges   = self.G.neighbourList(u).tolist()
+            length += self.G.weightList(u)[edges.index(v)]
+
+        return length
+
+
+    def test_searches_agree_with_dijkstra(self):
+        """ Do bidirectional Dijkstra and A* find the shortest paths? """
+
+        for s, t in [(0, 99), (9, 90), (45, 54), (12, 12)]:
+            dist, pred = dijkstrasShortestPath.dijkstra(self.G, s)
+
+            heuristic = dijkstrasShortestPath.euclideanHeuristic(self.coords,
+                                                                 t)
+            for length, path in [
+                    dijkstrasShortestPath.bidirectionalDijkstra(self.G, s, t),
+                    dijkstrasShortestPath.aStar(self.G, s, t),
+                    dijkstrasShortestPath.aStar(self.G, s, t, heuristic)]:
+                self.assertAlmostEqual(dist[t], length)
+                self.assertEqual([s, t], [path[0], path[-1]])
+                self.assertAlmostEqual(dist[t], self.pathLength(path))
+
+
+    def test_distance_matrix(self):
+        """ Does distanceMatrix give the rows of serial dijkstra? """
+
+        sources = [0, 7, 33, 99]
+        targets = [5, 50, 98]
+
+        matrix = dijkstrasShortestPath.distanceMatrix(self.G, sources, targets,
+                                                      numWorkers = 2,
+                                                      chunkSize = 1)
+
+        for iRow, s in enumerate(sources):
+            dist, pred = dijkstrasShortestPath.dijkstra(self.G, s)
+            self.assertTrue(np.allclose(dist[targets], matrix[iRow]))
+
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
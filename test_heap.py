@@ -0,0 +1,112 @@
+""" Unit test the priority queues in heap module. """
+
+#===============================================================================
+import unittest
+import heap
+
+
+#===============================================================================
+class QueueTests:
+    """ Tests shared by every queue with the IndexedHeap interface.
+
+        Subclasses set queueClass, and the keyword arguments its constructor
+        needs in queueOptions.
+    """
+
+    queueOptions = {}
+
+    def setUp(self):
+        """ A queue of five items, with priorities extracted in order. """
+
+        pairs      = [(10, 'a'), (3, 'b'), (16, 'c'), (7, 'd'), (13, 'e')]
+        self.queue = self.queueClass(pairs, **self.queueOptions)
+
+
+    def extractAll(self):
+        """ Return the items in the order they are extracted. """
+
+        items = []
+        while len(self.queue) > 0:
+            priority, item = self.queue.extractMin()
+            items.append(item)
+
+        return items
+
+
+    def test_extract_in_priority_order(self):
+        """ Are the items extracted lowest priority first? """
+
+        self.assertEqual(5, len(self.queue))
+        self.assertEqual((3, 'b'), self.queue.peekMin())
+        self.assertEqual(['b', 'd', 'a', 'e', 'c'], self.extractAll())
+
+
+    def test_decrease_key(self):
+        """ Does an item move forward when its priority is lowered? """
+
+        self.queue.decreaseKey('c', 9)
+
+        self.assertEqual(9, self.queue.priority('c'))
+        self.assertEqual(['b', 'd', 'c', 'a', 'e'], self.extractAll())
+
+
+    def test_increase_key_raised(self):
+        """ Is raising a priority with decreaseKey rejected? """
+
+        self.assertRaises(ValueError, self.queue.decreaseKey, 'b', 12)
+        self.assertEqual(3, self.queue.priority('b'))
+
+
+    def test_delete(self):
+        """ Is a deleted item never extracted? """
+
+        self.queue.delete('d')
+
+        self.assertFalse('d' in self.queue)
+        self.assertFalse(self.queue.contains('d'))
+        self.assertEqual(['b', 'a', 'e', 'c'], self.extractAll())
+
+
+    def test_insert_after_extract(self):
+        """ Is an item inserted after an extraction put in order? """
+
+        self.assertEqual((3, 'b'), self.queue.extractMin())
+        self.queue.insert(14, 'f')
+        self.queue.insert(8, 'g')
+
+        self.assertTrue('f' in self.queue)
+        self.assertEqual(['d', 'g', 'a', 'e', 'f', 'c'], self.extractAll())
+
+
+#===============================================================================
+class TestIndexedHeap(QueueTests, unittest.TestCase):
+    """ Unit test IndexedHeap. """
+
+    queueClass = heap.IndexedHeap
+
+
+#-------------------------------------------------------------------------------
+class TestBucketQueue(QueueTests, unittest.TestCase):
+    """ Unit test BucketQueue. """
+
+    queueClass   = heap.BucketQueue
+    queueOptions = {'maxWeight': 20}
+
+
+    def test_too_many_buckets_raised(self):
+        """ Is a maxWeight needing more than MAX_BUCKETS buckets rejected? """
+
+        self.assertRaises(ValueError, heap.BucketQueue, [(0, 'a')],
+                          heap.MAX_BUCKETS)
+
+
+#-------------------------------------------------------------------------------
+class TestRadixHeap(QueueTests, unittest.TestCase):
+    """ Unit test RadixHeap. """
+
+    queueClass = heap.RadixHeap
+
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+""" Unit test functions in johnsonsShortestPaths module. """
+
+#===============================================================================
+import unittest
+import numpy as np
+import johnsonsShortestPaths
+
+
+#===============================================================================
+class TestJohnson(unittest.TestCase):
+    """ Unit test bellmanFord and johnson. """
+
+    def setUp(self):
+        """ A graph with a negative edge but no negative cycle. """
+
+        # Adjacency List of graph G
+        self.G    = {}
+        self.G[0] = {1:4, 2:5}
+        self.G[1] = {3:2}
+        self.G[2] = {1:-3}
+        self.G[3] = {0:1}
+
+
+    def test_bellman_ford_from_source(self):
+        """ Does the shortest path to 1 take the negative edge from 2? """
+
+        dist, pred = johnsonsShortestPaths.bellmanFord(self.G, 0)
+
+        self.assertEqual([0, 2, 5, 4], dist.tolist())
+        self.assertEqual([-1, 2, 0, 1], pred.tolist())
+
+
+    def test_all_pairs(self):
+        """ Are all the shortest path lengths found? """
+
+        matrix    = johnsonsShortestPaths.johnson(self.G, numWorkers = 2)
+        expMatrix = [[0, 2, 5, 4],
+                     [3, 0, 8, 2],
+                     [0, -3, 0, -1],
+                     [1, 3, 6, 0]]
+
+        self.assertTrue(np.allclose(expMatrix, matrix))
+
+
+    def test_sources_and_targets(self):
+        """ Are only the rows and columns asked for returned? """
+
+        matrix = johnsonsShortestPaths.johnson(self.G, [2, 3], [1],
+                                               numWorkers = 1)
+
+        self.assertTrue(np.allclose([[-3], [3]], matrix))
+
+
+    def test_negative_cycle(self):
+        """ Is a negative cycle found and reported? """
+
+        # 1 -> 2 -> 1 has length -1
+        G    = {}
+        G[0] = {1:1}
+        G[1] = {2:-2}
+        G[2] = {1:1, 3:1}
+        G[3] = {}
+
+        with self.assertRaises(johnsonsShortestPaths.NegativeCycleError) \
+                as context:
+            johnsonsShortestPaths.johnson(G)
+
+        cycle = context.exception.cycle
+        self.assertEqual([1, 2], sorted(cycle))
+
+        length = sum(G[u][v] for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+        self.assertTrue(length < 0)
+
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
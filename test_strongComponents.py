@@ -0,0 +1,134 @@
+""" Unit test functions in strongComponents module. """
+
+#===============================================================================
+import os
+import tempfile
+import unittest
+import numpy as np
+import csrGraph
+import strongComponents
+
+
+#===============================================================================
+def adjacencyList(G):
+    """ Return the CSR graph G as an adjacency list labelled 1, ..., n. """
+
+    return dict((v + 1, [w + 1 for w in neighbours])
+                for v, neighbours in G.toAdjList().iteritems())
+
+#-------------------------------------------------------------------------------
+def partition(labels):
+    """ Return the components given by labels as a set of frozensets. """
+
+    components = {}
+    for node, label in enumerate(np.asarray(labels).tolist()):
+        components.setdefault(label, set()).add(node)
+
+    return set(frozenset(nodes) for nodes in components.values())
+
+
+#===============================================================================
+class TestStrongComponents(unittest.TestCase):
+    """ Unit test the strong component algorithms on CSR graphs. """
+
+    def setUp(self):
+        """ A chain of the components {0, 1, 2}, {3, 4}, {5} and {6, 7}. """
+
+        tails  = [0, 1, 2, 2, 3, 4, 4, 5, 6, 7]
+        heads  = [1, 2, 0, 3, 4, 3, 5, 6, 7, 6]
+        self.G = csrGraph.fromEdges(tails, heads, 8)
+
+        self.expComponents = set([frozenset([0, 1, 2]), frozenset([3, 4]),
+                                  frozenset([5]), frozenset([6, 7])])
+
+
+    def test_tarjan_agrees_with_kosaraju(self):
+        """ Do Tarjan's and Kosaraju's algorithms find the same components? """
+
+        labels, _ = strongComponents.tarjanSCC(self.G)
+        self.assertEqual(self.expComponents, partition(labels))
+
+        # Kosaraju's adjacency lists are labelled 1, ..., n
+        G    = adjacencyList(self.G)
+        Grev = adjacencyList(self.G.transpose())
+
+        leader, _ = strongComponents.kosarajuSCC(G, Grev)
+        self.assertEqual(self.expComponents,
+                         partition([leader[v + 1] for v in range(8)]))
+
+        leader, _ = strongComponents.kosarajuSCC(self.G, self.G.transpose())
+        self.assertEqual(self.expComponents, partition(leader))
+
+
+    def test_summary_sizes(self):
+        """ Does the summary give the size of each component? """
+
+        _, sortedSummary = strongComponents.tarjanSCC(self.G)
+
+        self.assertEqual([1, 2, 2, 3], sorted(sortedSummary[:, 1].tolist()))
+
+
+    def test_empty_graph(self):
+        """ Does a graph without nodes have no components? """
+
+        labels, sortedSummary = strongComponents.tarjanSCC({})
+
+        self.assertEqual({}, labels)
+        self.assertEqual((0, 2), sortedSummary.shape)
+
+        labels, sortedSummary = strongComponents.tarjanSCC(
+            csrGraph.fromEdges([], [], 0))
+
+        self.assertEqual(0, len(labels))
+        self.assertEqual((0, 2), sortedSummary.shape)
+
+
+    def test_condensation_order_is_topological(self):
+        """ Does every condensation edge go forward in the order? """
+
+        labels, _ = strongComponents.tarjanSCC(self.G)
+        C, order, components = strongComponents.condensation(self.G, labels)
+
+        position        = np.empty(len(order), dtype = np.int64)
+        position[order] = np.arange(len(order))
+
+        self.assertEqual(4, C.numNodes)
+        self.assertEqual(3, C.numEdges)
+        self.assertTrue(np.all(position[C.tails()] < position[C.neighbours]))
+
+        # The components in order are the chain from {0, 1, 2} to {6, 7}
+        self.assertEqual([0, 3, 5, 6],
+                         [components.tolist().index(c) for c in order])
+
+
+    def test_parallel_splits_subproblems(self):
+        """ Does parallelSCC agree when every subproblem is split again? """
+
+        labels, sortedSummary = strongComponents.parallelSCC(
+            self.G, numWorkers = 2, serialThreshold = 1)
+
+        self.assertEqual(self.expComponents, partition(labels))
+        self.assertEqual(4, len(sortedSummary))
+
+
+    def test_read_input_has_no_phantom_node(self):
+        """ Is a file labelled from 1 read without an extra node 0? """
+
+        handle, inputFile = tempfile.mkstemp(suffix = '.txt')
+        os.write(handle, '1 2\n2 1\n2 3\n')
+        os.close(handle)
+
+        try:
+            G, Grev, nodeLabels = strongComponents.readInput(inputFile)
+        finally:
+            os.remove(inputFile)
+
+        labels, _ = strongComponents.tarjanSCC(G)
+
+        self.assertEqual([1, 2, 3], nodeLabels.tolist())
+        self.assertEqual(set([frozenset([0, 1]), frozenset([2])]),
+                         partition(labels))
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
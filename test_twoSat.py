@@ -0,0 +1,50 @@
+""" Unit test functions in twoSat module. """
+
+#===============================================================================
+import unittest
+import numpy as np
+import twoSat
+
+
+#===============================================================================
+class TestTwoSat(unittest.TestCase):
+    """ Unit test twoSat.solve. """
+
+    def test_satisfiable(self):
+        """ Is a satisfiable problem solved with a satisfying assignment? """
+
+        # x1 or x2, ~x1 or x3, ~x2 or ~x3, x1 or ~x3
+        clauses = np.array([[1, 2], [-1, 3], [-2, -3], [1, -3]])
+
+        satisfiable, assignment = twoSat.solve(3, clauses)
+
+        self.assertTrue(satisfiable)
+        self.assertTrue(twoSat.isSatisfied(clauses, assignment))
+
+
+    def test_unsatisfiable(self):
+        """ Is a problem forcing x1 both ways found unsatisfiable? """
+
+        # x1 or x2, x1 or ~x2, ~x1 or x2, ~x1 or ~x2
+        clauses = np.array([[1, 2], [1, -2], [-1, 2], [-1, -2]])
+
+        satisfiable, assignment = twoSat.solve(2, clauses)
+
+        self.assertFalse(satisfiable)
+        self.assertEqual(None, assignment)
+
+
+    def test_random_planted_instance(self):
+        """ Is a random problem with a planted assignment solved? """
+
+        clauses = twoSat.randomInstance(50, 100, seed = 1)
+
+        satisfiable, assignment = twoSat.solve(50, clauses)
+
+        self.assertTrue(satisfiable)
+        self.assertTrue(twoSat.isSatisfied(clauses, assignment))
+
+
+#===============================================================================
+if __name__ == '__main__':
+    unittest.main()
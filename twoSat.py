@@ -0,0 +1,223 @@
+""" Solve 2-SAT problems with the strong components of the implication graph.
+"""
+#===============================================================================
+import sys
+import time
+import numpy as np
+import csrGraph
+import strongComponents
+
+
+#===============================================================================
+def readClauses(inputFile):
+    """ Read a 2-SAT problem from a clause file.
+
+        The first line holds the number of variables (and clauses), and each
+        line after it the two literals of a clause, a variable 1, ..., n or
+        its negation -1, ..., -n. The whole file is parsed by numpy in one
+        call.
+
+        Args:
+          inputFile: The input file name and location.
+
+        Returns:
+          numVariables: Number of variables.
+          clauses:      int array of (literal, literal) rows.
+
+        Raises:
+          IOError: If the file cannot be opened.
+    """
+
+    try:
+        values = np.fromfile(inputFile, dtype = np.int64, sep = ' ')
+    except IOError:
+        print 'Cannot open', inputFile
+        return 1
+
+    numVariables = int(values[0])
+    clauses      = values[1:].reshape(-1, 2)
+
+    return numVariables, clauses
+
+#-------------------------------------------------------------------------------
+def literalNodes(literals):
+    """ Return the implication graph node of each literal.
+
+        Variable x is node 2(x - 1) and its negation node 2(x - 1) + 1, so a
+        literal's negation is its node with the lowest bit flipped.
+    """
+
+    literals = np.asarray(literals, dtype = np.int64)
+
+    return 2 * (np.abs(literals) - 1) + (literals < 0)
+
+#-------------------------------------------------------------------------------
+def implicationGraph(numVariables, clauses):
+    """ Build the implication graph of a 2-SAT problem.
+
+        The clause (a or b) holds exactly when not a implies b and not b
+        implies a, so it gives the two edges ~a -> b and ~b -> a. The edges of
+        every clause are built as arrays and sorted into a CSR graph in one
+        go.
+
+        Args:
+          numVariables: Number of variables.
+          clauses:      int array of (literal, literal) rows.
+
+        Returns:
+          G: CSRGraph of the 2 * numVariables literals.
+
+        Raises:
+          None.
+    """
+
+    nodes = literalNodes(clauses).reshape(-1, 2)
+    a, b  = nodes[:, 0], nodes[:, 1]
+
+    tails = np.concatenate([a ^ 1, b ^ 1])
+    heads = np.concatenate([b, a])
+
+    return csrGraph.fromEdges(tails, heads, 2 * numVariables)
+
+#-------------------------------------------------------------------------------
+def solve(numVariables, clauses):
+    """ Decide whether a 2-SAT problem is satisfiable, and find an assignment.
+
+        The problem is unsatisfiable exactly when a variable and its negation
+        are in the same strong component of the implication graph. Otherwise
+        setting each variable so its literal's component comes later in
+        topological order than its negation's satisfies every clause. Tarjan's
+        algorithm labels components in reverse topological order, so x is
+        True when its label is below that of ~x.
+
+        Args:
+          numVariables: Number of variables.
+          clauses:      int array of (literal, literal) rows.
+
+        Returns:
+          satisfiable: True if the clauses can all be satisfied.
+          assignment:  bool array of the value of variables 1, ..., n, or None
+                       if unsatisfiable.
+
+        Raises:
+          None.
+    """
+
+    G         = implicationGraph(numVariables, clauses)
+    labels, _ = strongComponents.tarjanSCC(G)
+
+    positive = labels[0::2]
+    negative = labels[1::2]
+
+    if np.any(positive == negative):
+        return False, None
+
+    return True, positive < negative
+
+#-------------------------------------------------------------------------------
+def isSatisfied(clauses, assignment):
+    """ Return True if the assignment satisfies every clause. """
+
+    literals = np.asarray(clauses, dtype = np.int64)
+    values   = assignment[np.abs(literals) - 1] == (literals > 0)
+
+    return bool(np.all(values.any(axis = 1)))
+
+#-------------------------------------------------------------------------------
+def randomInstance(numVariables, numClauses, satisfiable = True, seed = None):
+    """ Generate a random 2-SAT problem.
+
+        Args:
+          numVariables: Number of variables.
+          numClauses:   Number of clauses.
+          satisfiable:  If True a random assignment is planted: any clause it
+                        does not satisfy has its first literal negated.
+                        Default is True.
+          seed:         Seed for the random number generator. Default is None.
+
+        Returns:
+          clauses: int array of (literal, literal) rows.
+
+        Raises:
+          None.
+    """
+
+    random    = np.random.RandomState(seed)
+    variables = random.randint(1, numVariables + 1, size = (numClauses, 2))
+    signs     = random.randint(0, 2, size = (numClauses, 2)) * 2 - 1
+    clauses   = variables * signs
+
+    if satisfiable:
+        planted   = random.randint(0, 2, size = numVariables).astype(bool)
+        values    = planted[variables - 1] == (clauses > 0)
+        violated  = ~values.any(axis = 1)
+        clauses[violated, 0] *= -1
+
+    return clauses
+
+#-------------------------------------------------------------------------------
+def benchmark(numVariables, numClauses, repeats = 3, seed = None):
+    """ Print the throughput of solve on random satisfiable problems.
+
+        Args:
+          numVariables: Number of variables.
+          numClauses:   Number of clauses.
+          repeats:      Number of problems to solve. Default is 3.
+          seed:         Seed for the random number generator. Default is None.
+
+        Returns:
+          clausesPerSecond: Average number of clauses solved per second.
+
+        Raises:
+          ValueError: If an assignment found does not satisfy its clauses.
+    """
+
+    totalTime = 0.0
+
+    for i in range(repeats):
+        clauses = randomInstance(numVariables, numClauses,
+                                 seed = None if seed is None else seed + i)
+
+        startTime = time.time()
+        satisfiable, assignment = solve(numVariables, clauses)
+        totalTime += time.time() - startTime
+
+        if not satisfiable or not isSatisfied(clauses, assignment):
+            raise ValueError('No satisfying assignment found')
+
+    clausesPerSecond = repeats * numClauses / totalTime
+    print numVariables, 'variables,', numClauses, 'clauses:', \
+          totalTime / repeats, 's,', clausesPerSecond, 'clauses/s'
+
+    return clausesPerSecond
+
+#-------------------------------------------------------------------------------
+def main(args):
+    """ Run main code.
+
+        Read each clause file given on the command line and print whether it
+        is satisfiable.
+
+        Args:
+          args: Command line arguments.
+
+        Results:
+          prints whether each problem is satisfiable
+
+        Raises:
+          None.
+    """
+
+    for inputFile in args[1:]:
+        problem = readClauses(inputFile)
+        if problem == 1:
+            continue
+
+        numVariables, clauses = problem
+        satisfiable, assignment = solve(numVariables, clauses)
+
+        print inputFile, satisfiable
+
+#===============================================================================
+if __name__ == "__main__":
+    main(sys.argv)